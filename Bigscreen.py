@@ -1,13 +1,19 @@
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-import requests
-import html
-import random
+from adaptive import ADAPTIVE
+from assets import get_photo, report_timings
+from instrumentation import monitor_event_loop
+from leaderboard import SOLO, TOP_K, get_default_leaderboard
+from question_bank import CATEGORIES, DIFFICULTIES
+from quiz import QuizController
+from spectator import MAX_FPS, RoomFeed, SpectatorModel
+from timer import TIMED
+from widgets import MAX_CHOICES, AnswerButtonPool, FeedbackBanner, SelectionBar
 
 
 class MenuFrame(tk.Frame):
-    def __init__(self, parent, controller, title, items):
+    MENU_ITEMS = ("Quiz", "About", "Leaderboard", "Spectate", "Exit")
+
+    def __init__(self, parent, controller, title, items=MENU_ITEMS):
         tk.Frame.__init__(self, parent)
         self.controller = controller
 
@@ -22,155 +28,55 @@ class MenuFrame(tk.Frame):
                                relief=tk.FLAT, command=lambda i=item: self.menu_click(i))
             button.pack(fill=tk.X, pady=5)
 
+    # Show the profile picture above the menu; every page has one
+    def create_profile_image(self):
+        # Load the shared, pre-scaled image
+        photo = get_photo(self, "profile.jpg", (50, 50))
+
+        # Create a label to display the image
+        image_label = tk.Label(self, image=photo)
+        image_label.image = photo  # Keep a reference to the image to prevent it from being garbage collected
+        image_label.place(relx=0, rely=0, relwidth=0.2, relheight=0.2)
+
     def menu_click(self, item):
         if item == "Quiz":
             self.controller.show_frame("QuizFrame")
         elif item == "About":
             self.controller.show_frame("AboutFrame")
+        elif item == "Leaderboard":
+            self.controller.show_frame("LeaderboardFrame")
+        elif item == "Spectate":
+            self.controller.show_frame("SpectatorFrame")
         elif item == "Exit":
             self.controller.destroy()
 
 
-class QuizFrame(MenuFrame, tk.Frame):
+class QuizFrame(MenuFrame, QuizController):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent)
-        MenuFrame.__init__(self, parent, controller, "Quiz Menu", ["Quiz", "About", "Exit"])
-        self.choices = []  # Initialize the choices attribute
-        self.question_index = 0  # Initialize the question_index attribute
+        MenuFrame.__init__(self, parent, controller, "Quiz Menu")
+        QuizController.__init__(self, self)  # Game logic shared with main.py
         
         self.create_profile_image()  # Add profile picture
         
+        self.selection_bar = SelectionBar(self, CATEGORIES, DIFFICULTIES + (ADAPTIVE, TIMED), self.change_selection, self.category)
+        self.selection_bar.pack(pady=(10, 0))
         self.question_label = tk.Label(self, text="", font=("Helvetica", 14))
         self.question_label.pack(pady=10)
+        self.answer_buttons = AnswerButtonPool(self, self.check_answer)
+        self.feedback = FeedbackBanner(self)  # Inline result of the last answer
+        self.timer_label = tk.Label(self, font=("Helvetica", 14))  # Placed in timed mode only
         self.play_game()  # Start the game
 
-    def get_question_pool(self, amount: int, category: int) -> list:
-        # Construct the API URL
-        url = f"https://opentdb.com/api.php?amount={amount}&category={category}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Check for any HTTP errors
-            data = response.json()
-            if 'results' in data:
-                return data["results"]
-            else:
-                print("Unexpected response format:")
-                print(data)
-                return []
-        except requests.exceptions.HTTPError as err:
-            print(f"HTTP error occurred: {err}")
-            return []
-        except requests.exceptions.RequestException as e:
-            print(f"Request error occurred: {e}")
-            return []
-
-    def shuffle_answers(self, question: dict) -> dict:
-        answers = question["incorrect_answers"] + [question["correct_answer"]]
-        random.shuffle(answers)
-        question["shuffled_answers"] = answers
-        return question
-
-    def print_question(self, question: dict) -> None:
-        # Display the question text
-        self.correct_answer = question["correct_answer"]
-        self.question_label.config(text=html.unescape(question["question"]))
-        shuffled_answers = question["shuffled_answers"]
-
-        # Destroy existing choice buttons
-        for choice in self.choices:
-            choice.destroy()
-        self.choices = []
-
-        # Create buttons for each answer choice
-        num_choices = len(shuffled_answers)
-        for i in range(num_choices):
-            answer_text = html.unescape(shuffled_answers[i])
-            button_width = 50  # Fixed width for better layout
-            choice = tk.Button(self, text=f"{i+1}. {answer_text}", width=button_width, command=lambda i=i: self.check_answer(i))
-            choice.pack(pady=5)
-            self.choices.append(choice)
-
-        # Check if the current question has a user_answer and update the UI accordingly
-        if question.get("user_answer") is not None:
-            user_choice = int(question["user_answer"]) - 1
-            self.choices[user_choice].config(bg="light green")  # Highlight the user's choice
-
-            # Disable all buttons after user has answered
-            for i in range(num_choices):
-                if i != user_choice:
-                    self.choices[i].config(state=tk.DISABLED)
-
-    def finish_game(self):
-        messagebox.showinfo("Game Over", "Game finished!")
-
-        # Destroy the choice buttons
-        for choice in self.choices:
-            choice.destroy()
-        self.choices = []
-
-        # Recreate the app window
-        self.destroy()
-        app = MobileFrame()
-        app.mainloop()
-
-    def restart_game(self):
-        # Reset question index and clear user answers
-        self.question_index = 0
-        for question in self.questions:
-            question["user_answer"] = None
-
-        # Destroy the restart button
-        self.pack_forget()
-
-        # Restart the game
-        self.play_game()
-
-    def check_answer(self, choice: int):
-        user_choice = str(choice + 1)
-        current_question = self.questions[self.question_index]
-        current_question["user_answer"] = user_choice
-
-        correct_answer = html.unescape(current_question["correct_answer"])
-        messagebox.showinfo("Result", f"The correct answer is: {correct_answer}")
-
-        self.question_index += 1
-        if self.question_index < len(self.questions):
-            # Destroy the choice buttons
-            for choice in self.choices:
-                choice.destroy()
-            self.choices = []
-
-            self.print_question(self.questions[self.question_index])
-        else:
-            self.finish_game()
-
-    def play_game(self):
-        amount = 4  # Number of questions
-        category = 18  # Category ID (Computer Science)
-        self.questions = self.get_question_pool(amount, category)
-        if not self.questions:
-            messagebox.showerror("Error", "Failed to fetch questions. Please try again later.")
-            self.destroy()
-            return
-        self.questions = [self.shuffle_answers(q) for q in self.questions]
-        self.print_question(self.questions[self.question_index])
-
-    def create_profile_image(self):
-        # Load and resize the image
-        image = Image.open("profile.jpg")
-        image = image.resize((50, 50), Image.LANCZOS)
-        photo = ImageTk.PhotoImage(image)
-
-        # Create a label to display the image
-        image_label = tk.Label(self, image=photo)
-        image_label.image = photo  # Keep a reference to the image to prevent it from being garbage collected
-        image_label.place(relx=0, rely=0, relwidth=0.2, relheight=0.2)
+    # Called by MobileFrame.show_frame whenever the quiz comes back on screen
+    def refresh(self):
+        self.resume()
 
 
 class AboutFrame(MenuFrame, tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent)
-        MenuFrame.__init__(self, parent, controller, "About Menu", ["Quiz", "About", "Exit"])
+        MenuFrame.__init__(self, parent, controller, "About Menu")
         self.create_content()
         self.create_profile_image()
 
@@ -205,16 +111,132 @@ class AboutFrame(MenuFrame, tk.Frame):
         # Disable text widget editing
         text_widget.config(state=tk.DISABLED)
 
-    def create_profile_image(self):
-        # Load and resize the image
-        image = Image.open("profile.jpg")
-        image = image.resize((50, 50), Image.LANCZOS)
-        photo = ImageTk.PhotoImage(image)
 
-        # Create a label to display the image
-        image_label = tk.Label(self, image=photo)
-        image_label.image = photo  # Keep a reference to the image to prevent it from being garbage collected
-        image_label.place(relx=0, rely=0, relwidth=0.2, relheight=0.2)
+class LeaderboardFrame(MenuFrame, tk.Frame):
+    def __init__(self, parent, controller):
+        tk.Frame.__init__(self, parent)
+        MenuFrame.__init__(self, parent, controller, "Leaderboard")
+        self.create_content()
+        self.create_profile_image()
+
+    def create_content(self):
+        self.content_frame = tk.Frame(self, bg="light blue")  # Set the background color to light blue
+        self.content_frame.place(relx=0.2, rely=0, relwidth=0.8, relheight=1)
+
+        # One column per mode with a label per rank, reused on every refresh
+        self.rows = {}
+        for mode in (SOLO, ADAPTIVE, TIMED):
+            column = tk.Frame(self.content_frame, bg="light blue")
+            column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
+            title = tk.Label(column, text=f"{mode.title()} Leaderboard", font=("Helvetica", 16), bg="light blue")
+            title.pack(pady=10)
+            self.rows[mode] = [tk.Label(column, font=("Helvetica", 14), bg="light blue", anchor=tk.W)
+                               for _ in range(TOP_K)]
+            for row in self.rows[mode]:
+                row.pack(fill=tk.X)
+
+    def refresh(self):
+        # The leaderboard keeps its top-k sorted in memory, so this is a fixed number of label updates
+        for mode, rows in self.rows.items():
+            entries = get_default_leaderboard().top(mode)
+            for i, row in enumerate(rows):
+                if i < len(entries):
+                    player, score, total = entries[i]
+                    row.config(text=f"{i+1}. {player}  {score}/{total}")
+                else:
+                    row.config(text="")
+
+
+class SpectatorFrame(MenuFrame, tk.Frame):
+    BAR_WIDTH = 300
+
+    def __init__(self, parent, controller, model=None):
+        tk.Frame.__init__(self, parent)
+        MenuFrame.__init__(self, parent, controller, "Spectate")
+        self.follow = model is None  # Follow a game server room unless the caller feeds the model itself
+        self.model = model or SpectatorModel()
+        self.feed = None
+        self.ticking = False
+        self.frames_drawn = 0
+        self.shown = {}  # widget -> text or bar width it shows, so unchanged widgets are not touched
+        self.create_content()
+        self.create_profile_image()
+
+    def create_content(self):
+        self.content_frame = tk.Frame(self, bg="light blue")  # Set the background color to light blue
+        self.content_frame.place(relx=0.2, rely=0, relwidth=0.8, relheight=1)
+
+        # Every widget is built once here; ticks only change text and bar lengths
+        self.question_label = tk.Label(self.content_frame, font=("Helvetica", 16), bg="light blue", wraplength=800)
+        self.question_label.pack(pady=(20, 10))
+
+        self.answer_rows = []
+        for _ in range(MAX_CHOICES):
+            row = tk.Frame(self.content_frame, bg="light blue")
+            row.pack(fill=tk.X, padx=20, pady=3)
+            answer = tk.Label(row, font=("Helvetica", 12), bg="light blue", width=40, anchor=tk.W)
+            answer.pack(side=tk.LEFT)
+            bar = tk.Canvas(row, width=self.BAR_WIDTH, height=20, bg="white", highlightthickness=0)
+            bar.pack(side=tk.LEFT, padx=10)
+            rect = bar.create_rectangle(0, 0, 0, 20, fill="#444444", width=0)
+            count = tk.Label(row, font=("Helvetica", 12), bg="light blue", width=6, anchor=tk.W)
+            count.pack(side=tk.LEFT)
+            self.answer_rows.append((answer, bar, rect, count))
+
+        title = tk.Label(self.content_frame, text="Room Leaderboard", font=("Helvetica", 14), bg="light blue")
+        title.pack(pady=(15, 5))
+        self.leader_rows = [tk.Label(self.content_frame, font=("Helvetica", 12), bg="light blue") for _ in range(TOP_K)]
+        for row in self.leader_rows:
+            row.pack()
+
+        self.status_label = tk.Label(self.content_frame, font=("Helvetica", 10), bg="light blue")
+        self.status_label.pack(side=tk.BOTTOM, pady=5)
+
+    def refresh(self):
+        # Start following the room the first time the view is shown
+        if self.feed is None and self.follow:
+            self.feed = RoomFeed(self.model)
+        if not self.ticking:
+            self.ticking = True
+            self.tick()
+
+    # Draw at most one frame per tick, and only when events arrived since the last one
+    def tick(self):
+        self.after(1000 // MAX_FPS, self.tick)
+        snapshot = self.model.take()
+        if snapshot is not None:
+            self.draw(snapshot)
+
+    # Update the pre-built widgets to show a snapshot
+    def draw(self, snapshot):
+        self.frames_drawn += 1
+        self.set_text(self.question_label, snapshot.question or "Waiting for the next question...")
+        most = max(snapshot.tally, default=0) or 1
+        for i, (answer, bar, rect, count) in enumerate(self.answer_rows):
+            if i < len(snapshot.answers):
+                self.set_text(answer, f"{i+1}. {snapshot.answers[i]}")
+                self.set_text(count, str(snapshot.tally[i]) if i < len(snapshot.tally) else "0")
+                votes = snapshot.tally[i] if i < len(snapshot.tally) else 0
+                width = self.BAR_WIDTH * votes // most
+            else:
+                self.set_text(answer, "")
+                self.set_text(count, "")
+                width = 0
+            if self.shown.get(bar) != width:
+                self.shown[bar] = width
+                bar.coords(rect, 0, 0, width, 20)
+        for i, row in enumerate(self.leader_rows):
+            if i < len(snapshot.leaders):
+                player, score = snapshot.leaders[i]
+                self.set_text(row, f"{i+1}. {player}  {score}")
+            else:
+                self.set_text(row, "")
+        self.set_text(self.status_label, f"{snapshot.players} players, {snapshot.events} events")
+
+    def set_text(self, widget, text):
+        if self.shown.get(widget) != text:
+            self.shown[widget] = text
+            widget.config(text=text)
 
 
 class MobileFrame(tk.Tk):
@@ -223,22 +245,43 @@ class MobileFrame(tk.Tk):
         self.geometry("1200x590")
         self.title("Trivea Game")
 
-        container = tk.Frame(self)
-        container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
+        self.container = tk.Frame(self)
+        self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
 
+        # Frames are built the first time they are shown
+        self.frame_classes = {F.__name__: F for F in (QuizFrame, AboutFrame, LeaderboardFrame, SpectatorFrame)}
         self.frames = {}
-        for F in (QuizFrame, AboutFrame):
-            page_name = F.__name__
-            frame = F(parent=container, controller=self)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
 
+        # Paint the empty window first, then build the quiz once it is on screen
+        self.bind("<Map>", self.on_first_map)
+
+        # Record event-loop lag when TRIVIA_METRICS is set
+        monitor_event_loop(self)
+
+    def on_first_map(self, event):
+        if event.widget is not self:
+            return
+        self.unbind("<Map>")
+        self.after_idle(self.load_first_frame)
+
+    def load_first_frame(self):
         self.show_frame("QuizFrame")
+        report_timings()
 
     def show_frame(self, cont):
-        frame = self.frames[cont]
+        frame = self.frames.get(cont)
+        if frame is None:
+            frame = self.frame_classes[cont](parent=self.container, controller=self)
+            self.frames[cont] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+        # Stop the quiz clock while another page covers the quiz
+        quiz = self.frames.get("QuizFrame")
+        if quiz is not None and quiz is not frame:
+            quiz.pause()
+        if hasattr(frame, "refresh"):
+            frame.refresh()
         frame.tkraise()
 
 # Main execution
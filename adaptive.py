@@ -0,0 +1,130 @@
+import collections
+import threading
+
+from engine import ingest
+from question_bank import DIFFICULTIES
+
+ADAPTIVE = "adaptive"  # Difficulty setting that lets the scheduler pick each question
+
+# Elo-style ratings for each difficulty bucket and the starting rating of a new player
+DIFFICULTY_RATINGS = {"easy": 1000, "medium": 1200, "hard": 1400}
+INITIAL_RATING = 1100
+K_FACTOR = 32  # Maximum rating change per answer
+TARGET_SUCCESS = 0.7  # Pick the bucket the player is expected to answer correctly this often
+
+BUFFER_SIZE = 8  # Questions kept ready per bucket
+LOW_WATER = 3  # Refill a likely bucket once it holds fewer than this many questions
+
+
+# SkillRating is a per-player skill estimate updated after every answer
+class SkillRating:
+    __slots__ = ("rating", "answered", "correct")
+
+    def __init__(self, rating=INITIAL_RATING):
+        self.rating = rating
+        self.answered = 0
+        self.correct = 0
+
+    # Probability that the player answers a question of this difficulty correctly
+    def expected(self, difficulty: str, rating=None) -> float:
+        rating = self.rating if rating is None else rating
+        return 1 / (1 + 10 ** ((DIFFICULTY_RATINGS[difficulty] - rating) / 400))
+
+    # Move the rating towards the observed result
+    def update(self, difficulty: str, correct: bool) -> None:
+        if difficulty not in DIFFICULTY_RATINGS:
+            return
+        self.rating += K_FACTOR * (correct - self.expected(difficulty))
+        self.answered += 1
+        self.correct += correct
+
+    # The bucket whose expected success rate is closest to the target
+    def pick(self, rating=None) -> str:
+        return min(DIFFICULTIES, key=lambda d: abs(self.expected(d, rating) - TARGET_SUCCESS))
+
+    # The buckets the next pick can land in, whichever way the next answer goes
+    def likely_next(self) -> set:
+        current = self.pick()
+        likely = {current}
+        for correct in (True, False):
+            rating = self.rating + K_FACTOR * (correct - self.expected(current))
+            likely.add(self.pick(rating))
+        return likely
+
+
+_ratings = {}
+
+
+# Return the skill estimate for a player, creating it on first use
+def get_rating(player: str) -> SkillRating:
+    rating = _ratings.get(player)
+    if rating is None:
+        rating = _ratings[player] = SkillRating()
+    return rating
+
+
+# AdaptiveScheduler hands out the next question from per-difficulty buffers it keeps topped up
+class AdaptiveScheduler:
+    def __init__(self, bank, category: int, rating: SkillRating, fetcher=None, skip=None):
+        # fetcher(amount, category, difficulty, qtype) is used when the bank cannot fill a bucket;
+        # skip(question) passes over questions the player has already seen
+        self.bank = bank
+        self.category = category
+        self.rating = rating
+        self.fetcher = fetcher
+        self.skip = skip
+        self.buffers = {difficulty: collections.deque() for difficulty in DIFFICULTIES}
+        self._refilling = set()
+        self._lock = threading.Lock()
+        for difficulty in DIFFICULTIES:
+            self.refill(difficulty)
+
+    # Take the next question in constant time, falling back to the nearest non-empty bucket
+    def next_question(self):
+        wanted = self.rating.pick()
+        order = sorted(DIFFICULTIES, key=lambda d: abs(DIFFICULTY_RATINGS[d] - DIFFICULTY_RATINGS[wanted]))
+        question = None
+        for difficulty in order:
+            if self.buffers[difficulty]:
+                question = self.buffers[difficulty].popleft()
+                break
+        self.prefetch_likely()
+        return question
+
+    # Score an answer and make sure the buckets it may lead to are ready
+    def record(self, question, correct: bool) -> None:
+        self.rating.update(question.difficulty, correct)
+        self.prefetch_likely()
+
+    def prefetch_likely(self) -> None:
+        for difficulty in self.rating.likely_next():
+            if len(self.buffers[difficulty]) < LOW_WATER:
+                self.refill(difficulty)
+
+    # Top a bucket up from the bank at once, or from the cache/API on a worker thread
+    def refill(self, difficulty: str) -> None:
+        buffer = self.buffers[difficulty]
+        buffer.extend(self.bank.draw(BUFFER_SIZE - len(buffer), self.category, difficulty, skip=self.skip))
+        if len(buffer) >= LOW_WATER:
+            return
+        with self._lock:
+            if difficulty in self._refilling:
+                return
+            self._refilling.add(difficulty)
+
+        def fetch():
+            try:
+                fetcher = self.fetcher
+                if fetcher is None:
+                    from question_cache import get_default_cache
+                    fetcher = get_default_cache().get
+                questions = ingest(fetcher(BUFFER_SIZE, self.category, difficulty, None))
+                if self.skip is not None:
+                    # Pass over seen questions like the bank does, unless that would leave nothing to play
+                    questions = [question for question in questions if not self.skip(question)] or questions
+                buffer.extend(questions)
+            finally:
+                with self._lock:
+                    self._refilling.discard(difficulty)
+
+        threading.Thread(target=fetch, name=f"adaptive-{difficulty}", daemon=True).start()
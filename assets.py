@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import tkinter as tk
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("TRIVIA_ASSET_CACHE", os.path.join(ASSET_DIR, ".asset_cache"))
+
+# Images and sizes the front-ends use, pre-scaled by `python assets.py`
+KNOWN_VARIANTS = [
+    ("profile.jpg", (50, 50)),
+    ("background.jpg", (768, 383)),
+    ("background.jpg", (1200, 590)),
+]
+
+_photos = {}  # (path, size) -> (tk interpreter, PhotoImage) shared by every frame in the process
+timings = []  # (name, size, source, milliseconds) for each load that missed the in-process cache
+
+
+# Return the path of the pre-scaled variant for a source file's current mtime and a target size
+def variant_path(path: str, size: tuple) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    mtime = os.stat(path).st_mtime_ns
+    return os.path.join(CACHE_DIR, f"{stem}-{size[0]}x{size[1]}-{mtime}.png")
+
+
+# Decode and resample the source once, writing the result to the disk cache
+def build_variant(path: str, size: tuple) -> str:
+    from PIL import Image  # Only needed when the disk cache is cold
+
+    target = variant_path(path, size)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    image = Image.open(path)
+    image = image.resize(size, Image.LANCZOS)
+    tmp = target + ".tmp"
+    image.save(tmp, "PNG")
+    os.replace(tmp, target)  # Never leave a half-written variant behind
+
+    # Drop variants built from older versions of the source
+    prefix = os.path.basename(target).rsplit("-", 1)[0] + "-"
+    for entry in os.listdir(CACHE_DIR):
+        if entry.startswith(prefix) and entry != os.path.basename(target):
+            os.remove(os.path.join(CACHE_DIR, entry))
+    return target
+
+
+# Return a shared PhotoImage of `name` resized to `size`, loading it at most once per process
+def get_photo(master, name: str, size: tuple):
+    path = os.path.join(ASSET_DIR, name)
+    key = (path, size)
+    cached = _photos.get(key)
+    if cached is not None and cached[0] is master.tk:
+        return cached[1]
+
+    start = time.perf_counter()
+    target = variant_path(path, size)
+    source = "disk"
+    if not os.path.exists(target):
+        target = build_variant(path, size)
+        source = "decoded"
+    # Tk reads PNG natively, so a warm disk cache skips PIL entirely
+    photo = tk.PhotoImage(master=master, file=target)
+    _photos[key] = (master.tk, photo)
+    timings.append((name, size, source, (time.perf_counter() - start) * 1000))
+    return photo
+
+
+# Print how each image was loaded and how long it took
+def report_timings() -> None:
+    for name, size, source, ms in timings:
+        print(f"Asset {name} {size[0]}x{size[1]}: {source} in {ms:.1f} ms")
+
+
+# Main execution: pre-scale every known variant so kiosks start with a warm disk cache
+if __name__ == "__main__":
+    for name, size in KNOWN_VARIANTS:
+        path = os.path.join(ASSET_DIR, name)
+        start = time.perf_counter()
+        if "--force" in sys.argv or not os.path.exists(variant_path(path, size)):
+            build_variant(path, size)
+        print(f"{name} {size[0]}x{size[1]}: ready in {(time.perf_counter() - start) * 1000:.1f} ms")
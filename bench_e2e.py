@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from stub_server import start_stub_server
+
+# End-to-end benchmark against the local OpenTDB stand-in: fetch latency through the client, hit
+# latency of the warmed question cache, cache behaviour, and questions played per second through the real Tk front-end.
+# Results are compared with bench_baseline.json and any regression beyond the tolerance fails the run.
+# Rendering needs a display; without one (or under plain CI) those metrics are skipped, not failed.
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+CATEGORY_IDS = [9, 17, 18, 21, 22, 23]
+ABSOLUTE_SLACK_MS = 1.0  # Latency noise ignored regardless of the relative tolerance
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# Raw fetch latency through the shared pooled client
+def bench_fetch(count: int) -> dict:
+    from trivia_client import get_default_client
+
+    client = get_default_client()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.fetch(4, random.choice(CATEGORY_IDS))
+        latencies.append((time.perf_counter() - start) * 1000)
+    metrics = client.metrics()
+    return {
+        "fetch_p50_ms": percentile(latencies, 0.5),
+        "fetch_p99_ms": percentile(latencies, 0.99),
+        "fetch_retries": metrics["retries"],
+    }
+
+
+# get_question_pool goes through the question cache. The cache is warmed first and only hits are
+# timed: with a ~99% hit rate a p99 over every lookup lands on the boundary between hits and network
+# misses and flips from run to run. Miss latency is the fetch latency measured above.
+def bench_cache(count: int) -> dict:
+    from question_bank import DIFFICULTIES, PER_REQUEST
+    from question_cache import get_default_cache
+
+    cache = get_default_cache()
+    for category in CATEGORY_IDS:
+        for difficulty in DIFFICULTIES:
+            cache.store(cache.fetcher(PER_REQUEST, category, difficulty, None), category)
+    latencies = []
+    for _ in range(count):
+        hits = cache.counters["hits"]
+        start = time.perf_counter()
+        cache.get(4, random.choice(CATEGORY_IDS), random.choice(DIFFICULTIES))
+        elapsed = (time.perf_counter() - start) * 1000
+        if cache.counters["hits"] > hits:
+            latencies.append(elapsed)
+    stats = cache.stats()
+    return {
+        "get_question_pool_hit_p50_ms": percentile(latencies, 0.5),
+        "get_question_pool_hit_p99_ms": percentile(latencies, 0.99),
+        "cache_hit_rate": stats["hit_rate"],
+    }
+
+
+# Decode, shuffle and play games with the engine alone
+def bench_engine(count: int) -> dict:
+    from engine import GameEngine, ingest
+    from question_cache import get_default_cache
+
+    results = get_default_cache().get(50, 18)
+    start = time.perf_counter()
+    answered = 0
+    while answered < count:
+        game = GameEngine(ingest(results))
+        while not game.finished:
+            game.answer(random.randrange(len(game.current.answers)))
+            answered += 1
+    return {"engine_questions_per_second": answered / (time.perf_counter() - start)}
+
+
+# Drive play_game and check_answer on the real main.py front-end
+def bench_render(seconds: float) -> dict:
+    import tkinter as tk
+
+    import main
+
+    try:
+        app = main.MobileFrame()
+    except tk.TclError as e:
+        print(f"Skipping render benchmark: {e}")
+        return {}
+    game = app.trivia_game
+    game.game_over_ms = 0  # Start the next game straight away instead of leaving the score up
+    rendered = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        if game.game is None or game.game.finished:
+            app.update()
+            continue
+        game.check_answer(random.randrange(len(game.game.current.answers)))
+        app.update_idletasks()
+        rendered += 1
+    elapsed = time.perf_counter() - start
+    app.destroy()
+    return {"questions_rendered_per_second": rendered / elapsed}
+
+
+# Compare against the baseline; returns a list of regression messages
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, value in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if name.endswith("_ms"):
+            if value > expected * (1 + tolerance) + ABSOLUTE_SLACK_MS:
+                regressions.append(f"{name}: {value:.2f} ms vs baseline {expected:.2f} ms")
+        elif name.endswith("_per_second") or name.endswith("_rate"):
+            if value < expected * (1 - tolerance):
+                regressions.append(f"{name}: {value:.2f} vs baseline {expected:.2f}")
+    return regressions
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end benchmark against the local OpenTDB stand-in")
+    parser.add_argument("--fetches", type=int, default=200)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--render-seconds", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.005, help="stub latency per response in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative regression")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    random.seed(0)
+    server, url = start_stub_server(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+
+    # Point every module at the stub before it is imported
+    os.environ["TRIVIA_API_BASE"] = url
+    os.environ["TRIVIA_API_RATE"] = "10000"
+    # Keep the benchmark's cache, scores and seen questions out of the real ones
+    scratch = tempfile.mkdtemp()
+    os.environ["TRIVIA_CACHE_PATH"] = os.path.join(scratch, "bench_cache.db")
+    os.environ["TRIVIA_LEADERBOARD_PATH"] = os.path.join(scratch, "bench_leaderboard.db")
+    os.environ["TRIVIA_SEEN_DIR"] = os.path.join(scratch, "seen")
+    import trivia_client
+    trivia_client.BACKOFF_BASE = 0.01  # Injected errors should not dominate the timings
+
+    results = {}
+    results.update(bench_fetch(args.fetches))
+    results.update(bench_cache(args.lookups))
+    results.update(bench_engine(100000))
+    results.update(bench_render(args.render_seconds))
+    server.shutdown()
+
+    for name, value in results.items():
+        print(f"{name:>32}: {value:.3f}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"Saved baseline to {BASELINE_PATH}")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_server import raise_fd_limit
+
+# Load generator for game_server.py: starts a server on one core with synthetic questions (or targets
+# --url), connects thousands of simulated players from several processes, spread over several rooms,
+# and reports how quickly questions reach them, how long answers take and how much CPU the server used.
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_server.py")
+CONNECT_BATCH = 200  # Players connecting at once while ramping up
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+# A minimal keep-alive HTTP/1.1 client for one simulated player
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def get(self, path: str) -> dict:
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        return json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        self.writer.close()
+
+
+# One player: follow the room state and answer each question after a short think time
+async def player(host, port, room, name, deadline, think, stats):
+    connection = await Connection.open(host, port)
+    try:
+        await connection.get(f"/join?room={room}&player={name}")
+        stats["joined"] += 1
+        version = 0
+        answered = set()
+        seen = set()
+        while time.time() < deadline:
+            sent = time.time()
+            state = await connection.get(f"/state?room={room}&since={version}")
+            version = state["version"]
+            key = (state["round"], state["index"])
+            if not state["open"]:
+                continue
+            if key not in seen:
+                seen.add(key)
+                if state["opened_at"] >= sent:  # Only polls already waiting when the question opened
+                    stats["fanout_ms"].append((time.time() - state["opened_at"]) * 1000)
+            if key in answered:
+                continue
+            answered.add(key)
+            await asyncio.sleep(random.uniform(0, think))
+            start = time.perf_counter()
+            reply = await connection.get(f"/answer?room={room}&player={name}&index={state['index']}"
+                                         f"&choice={random.randrange(len(state['answers']))}")
+            stats["answer_ms"].append((time.perf_counter() - start) * 1000)
+            stats["accepted" if reply["accepted"] else "rejected"] += 1
+    except (ConnectionError, asyncio.IncompleteReadError) as e:
+        stats["errors"] += 1
+        print(f"{name}: {e!r}")
+    finally:
+        connection.close()
+
+
+# Run a share of the players in this process and return their statistics
+async def run_players(host, port, first, count, rooms, deadline, think) -> dict:
+    stats = {"joined": 0, "accepted": 0, "rejected": 0, "errors": 0, "fanout_ms": [], "answer_ms": []}
+    tasks = []
+    for i in range(first, first + count):
+        tasks.append(asyncio.create_task(player(host, port, f"room{i % rooms}", f"bot{i}", deadline, think, stats)))
+        if len(tasks) % CONNECT_BATCH == 0:
+            await asyncio.sleep(0.05)  # Ramp up instead of overflowing the accept backlog
+    await asyncio.gather(*tasks)
+    return stats
+
+
+def worker(host, port, first, count, rooms, deadline, think) -> dict:
+    raise_fd_limit()
+    return asyncio.run(run_players(host, port, first, count, rooms, deadline, think))
+
+
+async def server_stats(host, port) -> dict:
+    connection = await Connection.open(host, port)
+    try:
+        return await connection.get("/stats")
+    finally:
+        connection.close()
+
+
+def run(host, port, clients, rooms, seconds, think, processes):
+    before = asyncio.run(server_stats(host, port))
+    start = time.time()
+    deadline = start + seconds
+    share = -(-clients // processes)
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(worker, host, port, first, min(share, clients - first), rooms, deadline, think)
+                   for first in range(0, clients, share)]
+        time.sleep(max(0.0, deadline - time.time() - 1))
+        peak = asyncio.run(server_stats(host, port))
+        stats = {"joined": 0, "accepted": 0, "rejected": 0, "errors": 0, "fanout_ms": [], "answer_ms": []}
+        for future in futures:
+            for name, value in future.result().items():
+                stats[name] += value
+    after = asyncio.run(server_stats(host, port))
+
+    elapsed = time.time() - start
+    print(f"{stats['joined']}/{clients} players in {rooms} rooms for {elapsed:.1f}s, "
+          f"{peak['connections'] - 1} concurrent connections")
+    print(f"answers: {stats['accepted']} accepted, {stats['rejected']} rejected, {stats['errors']} errors, "
+          f"{stats['accepted'] / elapsed:.0f}/s")
+    print(f"question fan-out: p50 {percentile(stats['fanout_ms'], 0.5):.1f} ms, "
+          f"p99 {percentile(stats['fanout_ms'], 0.99):.1f} ms")
+    print(f"answer round trip: p50 {percentile(stats['answer_ms'], 0.5):.1f} ms, "
+          f"p99 {percentile(stats['answer_ms'], 0.99):.1f} ms")
+    print(f"server CPU: {(after['cpu_seconds'] - before['cpu_seconds']) / elapsed:.0%} of one core, "
+          f"{after['requests'] - before['requests']} requests")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for the multiplayer game server")
+    parser.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8766; default starts one")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--think", type=float, default=1.0, help="maximum seconds before a bot answers")
+    parser.add_argument("--question-seconds", type=float, default=3.0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="load generator processes")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    server = None
+    if args.url:
+        host, port = args.url.split("//", 1)[-1].rsplit(":", 1)
+    else:
+        server = subprocess.Popen([sys.executable, SERVER, "--port", "0", "--synthetic",
+                                   "--question-seconds", str(args.question_seconds)],
+                                  stdout=subprocess.PIPE, text=True)
+        host, port = server.stdout.readline().rsplit("//", 1)[1].strip().rsplit(":", 1)
+    try:
+        run(host, int(port), args.clients, args.rooms, args.seconds, args.think, max(1, args.processes))
+    finally:
+        if server is not None:
+            server.terminate()
@@ -0,0 +1,76 @@
+import random
+import sys
+import time
+import tkinter as tk
+
+from engine import Question
+from widgets import AnswerButtonPool
+
+# Render N synthetic questions with the old destroy/recreate strategy and with the pooled buttons.
+# Needs a display, so on a headless machine run it as: xvfb-run python bench_render.py [N]
+
+
+def make_questions(count: int) -> list:
+    questions = []
+    for i in range(count):
+        size = random.choice((2, 4))  # Mix true/false and multiple choice like the real API
+        questions.append(Question(f"Question {i}?", tuple(f"Answer {i}.{j}" for j in range(size)), 0))
+    return questions
+
+
+# The pre-pooling print_question: destroy every button and build new ones
+def render_recreate(root, state, question):
+    for choice in state:
+        choice.destroy()
+    state.clear()
+    for i in range(len(question.answers)):
+        choice = tk.Button(root, text=f"{i+1}. {question.answers[i]}", width=50, command=lambda i=i: None)
+        choice.pack(pady=5)
+        state.append(choice)
+
+
+def render_pool(root, state, question):
+    state.show(question.answers)
+
+
+def tcl_commands(root) -> int:
+    return len(root.tk.call("info", "commands"))
+
+
+def run(name, render, make_state, questions):
+    root = tk.Tk()
+    label = tk.Label(root, wraplength=400)
+    label.pack(pady=40)
+    state = make_state(root)
+    root.update()
+
+    commands_before = tcl_commands(root)
+    latencies = []
+    for question in questions:
+        start = time.perf_counter()
+        label.config(text=question.text)
+        render(root, state, question)
+        root.update_idletasks()  # Include the geometry pass in the measurement
+        latencies.append(time.perf_counter() - start)
+    commands_after = tcl_commands(root)
+    widgets = len(root.winfo_children())
+    root.destroy()
+
+    latencies.sort()
+    print(f"{name:>9}: mean {sum(latencies) / len(latencies) * 1e6:8.1f} us, "
+          f"p50 {latencies[len(latencies) // 2] * 1e6:8.1f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:8.1f} us, "
+          f"Tcl commands {commands_before} -> {commands_after} ({commands_after - commands_before:+d}), "
+          f"widgets {widgets}")
+
+
+# Main execution
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(0)
+    questions = make_questions(count)
+    try:
+        run("recreate", render_recreate, lambda root: [], questions)
+        run("pool", render_pool, lambda root: AnswerButtonPool(root, lambda i: None), questions)
+    except tk.TclError as e:
+        sys.exit(f"Tk is not available ({e}); run under xvfb-run")
@@ -0,0 +1,106 @@
+import argparse
+import queue
+import random
+import threading
+import time
+import tkinter as tk
+
+from Bigscreen import SpectatorFrame
+from spectator import SpectatorModel
+
+# Feed the Bigscreen spectator view a synthetic event stream and measure event-loop lag, once with the
+# coalesced frame-rate-capped ticks and once with a naive redraw per event for comparison.
+# Needs a display, so on a headless machine run it as: xvfb-run python bench_spectator.py
+
+PROBE_INTERVAL = 10  # Milliseconds between event-loop lag probes
+
+
+def make_event(rng, bots):
+    roll = rng.random()
+    if roll < 0.001:
+        return {"type": "question", "text": f"Question {rng.randrange(1000)}?",
+                "answers": [f"Answer {j}" for j in range(4)]}
+    if roll < 0.1:
+        return {"type": "score", "player": f"bot{rng.randrange(bots)}", "score": rng.randrange(100)}
+    return {"type": "answer", "choice": rng.randrange(4)}
+
+
+# Push `rate` events per second to sink from a worker thread until stopped
+def produce(sink, rate, bots, stop, sent):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    while not stop.is_set():
+        due = int((time.perf_counter() - start) * rate)
+        while sent[0] < due:
+            sink(make_event(rng, bots))
+            sent[0] += 1
+        time.sleep(0.001)
+
+
+def run(name, rate, seconds, bots, coalesced):
+    root = tk.Tk()
+    root.geometry("1200x590")
+    model = SpectatorModel()
+    frame = SpectatorFrame(root, None, model)
+    frame.pack(fill=tk.BOTH, expand=True)
+    model.push({"type": "question", "text": "Warm-up?", "answers": ["A", "B", "C", "D"]})
+    root.update()
+
+    applied = [0]
+    if coalesced:
+        sink = model.push
+        frame.refresh()
+    else:
+        # Naive: every event goes through the Tk thread and is drawn on its own
+        inbox = queue.SimpleQueue()
+        sink = inbox.put
+
+        def drain():
+            try:
+                while True:
+                    model.push(inbox.get_nowait())
+                    frame.draw(model.take())
+                    applied[0] += 1
+            except queue.Empty:
+                pass
+            root.after(1, drain)
+
+        drain()
+
+    lags = []
+
+    def probe(expected):
+        now = time.monotonic()
+        lags.append(max(0.0, (now - expected) * 1000))
+        root.after(PROBE_INTERVAL, probe, now + PROBE_INTERVAL / 1000)
+
+    root.after(PROBE_INTERVAL, probe, time.monotonic() + PROBE_INTERVAL / 1000)
+
+    stop = threading.Event()
+    sent = [0]
+    producer = threading.Thread(target=produce, args=(sink, rate, bots, stop, sent), daemon=True)
+    root.after(int(seconds * 1000), root.quit)
+    producer.start()
+    root.mainloop()
+    stop.set()
+    producer.join()
+    events = model.events - 1 if coalesced else applied[0]
+    frames = frame.frames_drawn
+    root.destroy()
+
+    lags.sort()
+    print(f"{name:>9}: {sent[0] / seconds:9.0f} events/s sent, {events / seconds:9.0f} applied, "
+          f"{frames / seconds:6.1f} frames/s, lag p50 {lags[len(lags) // 2]:6.1f} ms, "
+          f"p99 {lags[min(len(lags) - 1, int(len(lags) * 0.99))]:7.1f} ms, max {lags[-1]:7.1f} ms")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spectator view event-rate benchmark")
+    parser.add_argument("--rate", type=float, default=50000, help="events per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--bots", type=int, default=5000)
+    args = parser.parse_args()
+
+    run("naive", args.rate, args.seconds, args.bots, coalesced=False)
+    run("coalesced", args.rate, args.seconds, args.bots, coalesced=True)
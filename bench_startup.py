@@ -0,0 +1,77 @@
+import importlib
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Measure cold startup of both entry points in fresh interpreters: time to import the module,
+# time until the main window is mapped and time until the first question can be answered.
+# Needs a display, so on a headless machine run it as: xvfb-run python bench_startup.py [runs]
+# Pair it with TRIVIA_OFFLINE=1 and a warm question cache to leave the network out of the numbers.
+
+ENTRY_POINTS = ["main", "Bigscreen"]
+TIMEOUT = 30.0  # Seconds to wait for the first question before giving up on a run
+
+
+# True once the quiz has put answer buttons on screen
+def question_ready(app) -> bool:
+    game = getattr(app, "trivia_game", None) or getattr(app, "frames", {}).get("QuizFrame")
+    return game is not None and game.answer_buttons.visible > 0
+
+
+# Runs inside the child interpreter; `spawned` is the wall-clock time the parent started it
+def child(entry: str, spawned: float) -> None:
+    result = {"entry": entry, "interpreter_ms": (time.time() - spawned) * 1000}
+    start = time.time()
+    module = importlib.import_module(entry)
+    result["import_ms"] = (time.time() - start) * 1000
+
+    app = module.MobileFrame()
+
+    def on_map(event):
+        if event.widget is app and "first_map_ms" not in result:
+            result["first_map_ms"] = (time.time() - spawned) * 1000
+
+    app.bind("<Map>", on_map, add="+")
+
+    def poll():
+        if question_ready(app):
+            result["first_question_ms"] = (time.time() - spawned) * 1000
+        elif time.time() - spawned < TIMEOUT:
+            app.after(5, poll)
+            return
+        print(json.dumps(result))
+        app.destroy()
+
+    app.after(5, poll)
+    app.mainloop()
+
+
+# Spawn a fresh interpreter per run and collect its timings
+def measure(entry: str, runs: int) -> list:
+    results = []
+    for _ in range(runs):
+        spawned = time.time()
+        output = subprocess.run([sys.executable, __file__, "--child", entry, repr(spawned)],
+                                capture_output=True, text=True, check=True).stdout
+        # The app prints its own diagnostics too, so pick out our result line
+        line = next(line for line in output.splitlines() if line.startswith('{"entry"'))
+        results.append(json.loads(line))
+    return results
+
+
+# Main execution
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], float(sys.argv[3]))
+        sys.exit()
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for entry in ENTRY_POINTS:
+        results = measure(entry, runs)
+        line = f"{entry:>9}:"
+        for key in ("interpreter_ms", "import_ms", "first_map_ms", "first_question_ms"):
+            values = [result[key] for result in results if key in result]
+            line += f" {key} {statistics.median(values):7.1f}" if values else f" {key}     n/a"
+        print(line + f" (median of {runs})")
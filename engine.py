@@ -0,0 +1,110 @@
+import array
+import html
+import random
+import sys
+import time
+
+import instrumentation
+
+UNANSWERED = 255  # Marker stored in GameEngine.choices for questions not answered yet
+
+
+# Question is an immutable, HTML-decoded trivia question with its answers shuffled once at ingest
+class Question:
+    __slots__ = ("text", "answers", "correct", "category", "difficulty", "type")
+
+    def __init__(self, text: str, answers: tuple, correct: int, category: str = "", difficulty: str = "",
+                 type: str = ""):
+        self.text = text
+        self.answers = answers  # Tuple of decoded answer strings in display order
+        self.correct = correct  # Index of the correct answer in `answers`
+        self.category = category
+        self.difficulty = difficulty
+        self.type = type
+
+    # Build a Question from an Open Trivia Database result, decoding and shuffling it once
+    @classmethod
+    def from_api(cls, raw: dict, rng=random):
+        correct_answer = html.unescape(raw["correct_answer"])
+        answers = [html.unescape(answer) for answer in raw["incorrect_answers"]]
+        answers.append(correct_answer)
+        rng.shuffle(answers)
+        # Interning the metadata keeps one copy of each string however many questions are loaded
+        return cls(html.unescape(raw["question"]), tuple(answers), answers.index(correct_answer),
+                   sys.intern(raw.get("category", "")), sys.intern(raw.get("difficulty", "")),
+                   sys.intern(raw.get("type", "")))
+
+    @property
+    def correct_answer(self) -> str:
+        return self.answers[self.correct]
+
+    def __repr__(self):
+        return f"Question({self.text!r}, {self.answers!r}, {self.correct})"
+
+
+# Convert a list of raw API results into ready-to-play Questions
+@instrumentation.timed("ingest_shuffle")
+def ingest(results: list, rng=random) -> list:
+    return [Question.from_api(raw, rng) for raw in results]
+
+
+# GameEngine holds the state of one game independently of any UI
+class GameEngine:
+    __slots__ = ("questions", "index", "choices", "latencies")
+
+    def __init__(self, questions: list):
+        self.questions = list(questions)
+        self.index = 0
+        self.choices = bytearray([UNANSWERED]) * len(self.questions)  # Chosen answer index per question
+        self.latencies = array.array("I", bytes(4 * len(self.questions)))  # Milliseconds taken per question
+
+    # The question currently being asked, or None once the game is over
+    @property
+    def current(self):
+        return self.questions[self.index] if self.index < len(self.questions) else None
+
+    @property
+    def finished(self) -> bool:
+        return self.index >= len(self.questions)
+
+    # Record an answer for the current question and move on; returns whether it was correct
+    def answer(self, choice: int, latency_ms: float = 0) -> bool:
+        question = self.questions[self.index]
+        self.choices[self.index] = choice
+        self.latencies[self.index] = round(latency_ms)
+        self.index += 1
+        return choice == question.correct
+
+    # Leave the current question unanswered, e.g. when its time runs out, and move on
+    def time_out(self, latency_ms: float = 0) -> None:
+        self.latencies[self.index] = round(latency_ms)
+        self.index += 1
+
+    # Return the answer index chosen for question i, or None if it is unanswered
+    def choice_for(self, i: int):
+        choice = self.choices[i]
+        return None if choice == UNANSWERED else choice
+
+    # Number of questions answered correctly so far
+    def score(self) -> int:
+        return sum(1 for question, choice in zip(self.questions, self.choices) if choice == question.correct)
+
+    # Append a question to the end of the game, e.g. one picked adaptively
+    def add(self, question: Question) -> None:
+        self.questions.append(question)
+        self.choices.append(UNANSWERED)
+        self.latencies.append(0)
+
+
+# Main execution: benchmark headless game sessions on synthetic questions
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    raw = [{"question": f"Question &quot;{i}&quot;?", "correct_answer": "A &amp; B",
+            "incorrect_answers": ["C", "D", "E"], "difficulty": "easy", "type": "multiple"} for i in range(4)]
+    start = time.perf_counter()
+    for _ in range(sessions):
+        game = GameEngine(ingest(raw))
+        while not game.finished:
+            game.answer(random.randrange(len(game.current.answers)))
+    elapsed = time.perf_counter() - start
+    print(f"{sessions} sessions in {elapsed:.3f}s ({elapsed / (sessions * len(raw)) * 1e6:.2f} us per question)")
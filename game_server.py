@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import resource
+import sys
+import time
+from urllib.parse import parse_qs, urlparse
+
+from engine import GameEngine, ingest
+from question_bank import CATEGORIES
+
+# Multiplayer rooms over plain HTTP on localhost. Every player in a room answers the same shared batch
+# of questions; each player's answers live in a GameEngine over that batch, exactly as in the Tk apps.
+# Clients long-poll /state with the last version they saw, so a single asyncio loop can hold thousands
+# of idle connections. Answers only mark the room dirty; the state is rebuilt, encoded once and handed
+# to every waiting poller at most once per BROADCAST_INTERVAL.
+#
+#   /join?room=R&player=P[&category=C]     -> {"room", "player", "version"}
+#   /state?room=R&since=V                  -> room state once its version is newer than V
+#   /answer?room=R&player=P&index=I&choice=N -> {"accepted", "correct"}
+#   /leave?room=R&player=P, /stats
+#
+# A room is closed and dropped when its last player leaves, or once no request has touched it for
+# ROOM_IDLE_SECONDS (players that vanished without /leave); at most MAX_ROOMS are open at a time.
+
+QUESTIONS_PER_ROUND = 10
+QUESTION_SECONDS = 15.0  # Time allowed per question; a question closes early once everyone has answered
+INTERMISSION = 3.0  # Seconds between rounds
+BROADCAST_INTERVAL = 0.1  # Score updates are coalesced into one state publish per interval
+POLL_TIMEOUT = 25.0  # Long polls return the unchanged state after this long
+RETRY_DELAY = 5.0  # Seconds before fetching again after an empty batch
+LEADERS = 10  # Scores included in every state publish
+DEFAULT_CATEGORY = 18
+ROOM_IDLE_SECONDS = 60.0  # Rooms with no requests for this long are closed; longer than POLL_TIMEOUT
+REAP_INTERVAL = 5.0  # Seconds between checks for idle rooms
+MAX_ROOMS = 1000
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+# Room is one shared question batch, the players answering it and the state they are sent
+class Room:
+    def __init__(self, name: str, category: int, fetcher, amount=QUESTIONS_PER_ROUND,
+                 question_seconds=QUESTION_SECONDS):
+        # fetcher(amount, category) returns raw API results and may block; it runs in an executor
+        self.name = name
+        self.category = category
+        self.fetcher = fetcher
+        self.amount = amount
+        self.question_seconds = question_seconds
+
+        self.players = {}  # player -> GameEngine over the current round's questions
+        self.scores = {}  # player -> correct answers across rounds
+        self.questions = []
+        self.round = 0
+        self.index = 0
+        self.open = False  # Whether the current question accepts answers
+        self.opened_at = 0.0  # Wall-clock time the current question was opened
+        self.tally = []  # Answers received per choice for the current question
+        self.answered = 0
+        self.last_correct = None  # Correct choice of the question that just closed
+
+        self.active_at = time.monotonic()  # Last join, answer or poll, for closing abandoned rooms
+        self.closed = False
+        self.version = 0
+        self.state = b"{}"  # Encoded state for `version`, shared by every poller
+        self._dirty = True
+        self._changed = asyncio.get_running_loop().create_future()
+        self._all_answered = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()), asyncio.create_task(self._broadcast())]
+
+    # Add a player; late joiners start on the current question
+    def join(self, player: str) -> None:
+        self.active_at = time.monotonic()
+        if player not in self.players:
+            engine = GameEngine(self.questions)
+            engine.index = self.index
+            self.players[player] = engine
+            self.scores.setdefault(player, 0)
+            self._dirty = True
+
+    def leave(self, player: str) -> None:
+        if self.players.pop(player, None) is not None:
+            self.scores.pop(player, None)
+            self._dirty = True
+
+    # Record a player's answer to question `index`; returns None if it is not accepted
+    def answer(self, player: str, index: int, choice: int):
+        self.active_at = time.monotonic()
+        engine = self.players.get(player)
+        if engine is None or not self.open or index != self.index or engine.index != index \
+                or not 0 <= choice < len(self.tally):
+            return None
+        correct = engine.answer(choice)
+        self.scores[player] += correct
+        self.tally[choice] += 1
+        self.answered += 1
+        self._dirty = True  # Published with the next broadcast tick, not per answer
+        if self.answered >= len(self.players):
+            self._all_answered.set()
+        return correct
+
+    # Wait until the state is newer than `since` or the poll times out, then return it
+    async def wait(self, since: int, timeout=POLL_TIMEOUT) -> bytes:
+        self.active_at = time.monotonic()
+        if self.version <= since:
+            await asyncio.wait([self._changed], timeout=timeout)
+        return self.state
+
+    # Encode the state once and wake every poller
+    def publish(self) -> None:
+        if self.closed:
+            return
+        self._dirty = False
+        self.version += 1
+        question = self.questions[self.index] if self.open else None
+        self.state = json.dumps({
+            "room": self.name,
+            "version": self.version,
+            "round": self.round,
+            "index": self.index,
+            "total": len(self.questions),
+            "open": self.open,
+            "question": question.text if question else None,
+            "answers": question.answers if question else [],
+            "opened_at": self.opened_at,
+            "seconds": self.question_seconds,
+            "tally": self.tally,
+            "answered": self.answered,
+            "players": len(self.players),
+            "last_correct": self.last_correct,
+            "leaders": heapq.nlargest(LEADERS, self.scores.items(), key=lambda item: item[1]),
+        }).encode()
+        changed, self._changed = self._changed, asyncio.get_running_loop().create_future()
+        changed.set_result(None)
+
+    # Stop fetching and broadcasting; pollers still waiting get the last state at once
+    def close(self) -> None:
+        self.closed = True
+        for task in self._tasks:
+            task.cancel()
+        if not self._changed.done():
+            self._changed.set_result(None)
+
+    # Play rounds forever: fetch a batch, then open and close each question in turn
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self.closed:
+            try:
+                results = await loop.run_in_executor(None, self.fetcher, self.amount, self.category)
+                questions = ingest(results or [])
+            except Exception as e:
+                # A failing fetcher is retried like an empty batch rather than ending the room's game
+                print(f"Room {self.name}: fetching questions failed: {e!r}", file=sys.stderr)
+                questions = []
+            if not questions:
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            self._start_round(questions)
+            for index in range(len(questions)):
+                self._open_question(index)
+                try:
+                    await asyncio.wait_for(self._all_answered.wait(), self.question_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                if self.closed:
+                    return  # Closed while the question was open, e.g. by its last player leaving
+                self._close_question()
+            await asyncio.sleep(INTERMISSION)
+
+    async def _broadcast(self):
+        while not self.closed:
+            await asyncio.sleep(BROADCAST_INTERVAL)
+            if self._dirty:
+                self.publish()
+
+    def _start_round(self, questions):
+        self.questions = questions
+        self.round += 1
+        for player in self.players:
+            self.players[player] = GameEngine(questions)
+
+    def _open_question(self, index):
+        self.index = index
+        self.open = True
+        self.opened_at = time.time()
+        self.tally = [0] * len(self.questions[index].answers)
+        self.answered = 0
+        self._all_answered.clear()
+        self.publish()  # Question changes go out at once; only score updates wait for a tick
+
+    def _close_question(self):
+        self.open = False
+        self.last_correct = self.questions[self.index].correct
+        for engine in self.players.values():
+            if engine.index == self.index:
+                engine.index += 1  # Unanswered, like running out of time in the Tk apps
+        self.publish()
+
+
+# GameServer routes HTTP requests to rooms, creating a room on its first join and dropping it once unused
+class GameServer:
+    def __init__(self, fetcher=None, question_seconds=QUESTION_SECONDS, amount=QUESTIONS_PER_ROUND,
+                 idle_seconds=ROOM_IDLE_SECONDS, max_rooms=MAX_ROOMS):
+        self.fetcher = fetcher
+        self.question_seconds = question_seconds
+        self.amount = amount
+        self.idle_seconds = idle_seconds
+        self.max_rooms = max_rooms
+        self.rooms = {}
+        self.counters = {"connections": 0, "requests": 0, "answers": 0, "rooms_closed": 0}
+        self._reaper = None
+
+    # Return a room, creating it if there is room for one more; None once max_rooms are open
+    def room(self, name: str, category: int = DEFAULT_CATEGORY):
+        room = self.rooms.get(name)
+        if room is None:
+            if len(self.rooms) >= self.max_rooms:
+                return None
+            fetcher = self.fetcher
+            if fetcher is None:
+                from question_cache import get_default_cache
+                fetcher = get_default_cache().get
+            room = self.rooms[name] = Room(name, category, fetcher, self.amount, self.question_seconds)
+            if self._reaper is None:
+                self._reaper = asyncio.create_task(self._reap())
+        return room
+
+    # Close a room and forget it
+    def drop(self, name: str) -> None:
+        room = self.rooms.pop(name, None)
+        if room is not None:
+            room.close()
+            self.counters["rooms_closed"] += 1
+
+    # Drop rooms that no request has touched for idle_seconds
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            idle_since = time.monotonic() - self.idle_seconds
+            for name in [name for name, room in self.rooms.items() if room.active_at < idle_since]:
+                self.drop(name)
+
+    # Serve one keep-alive connection
+    async def handle(self, reader, writer):
+        self.counters["connections"] += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, _, headers = head.decode("latin-1").partition("\r\n")
+                parts = request_line.split(" ")
+                if len(parts) != 3:
+                    break
+                url = urlparse(parts[1])
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                self.counters["requests"] += 1
+                try:
+                    status, body = await self.route(url.path, params)
+                except (KeyError, ValueError) as e:
+                    status, body = 400, json.dumps({"error": f"bad parameter {e}"}).encode()
+                writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                             % (status, STATUS_TEXT[status].encode(), len(body), body))
+                await writer.drain()
+                if "connection: close" in headers.lower():
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.counters["connections"] -= 1
+            writer.close()
+
+    async def route(self, path, params):
+        if path == "/stats":
+            return 200, json.dumps(dict(self.counters, rooms=len(self.rooms),
+                                        cpu_seconds=time.process_time())).encode()
+        if path == "/join":
+            category = int(params.get("category", DEFAULT_CATEGORY))
+            if category not in CATEGORIES:
+                return 400, b'{"error": "unknown category"}'
+            room = self.room(params["room"], category)
+            if room is None:
+                return 503, b'{"error": "too many rooms"}'
+            room.join(params["player"])
+            return 200, json.dumps({"room": room.name, "player": params["player"], "version": room.version}).encode()
+        room = self.rooms.get(params["room"])
+        if room is None:
+            return 404, b'{"error": "no such room"}'
+        if path == "/state":
+            return 200, await room.wait(int(params.get("since", 0)))
+        if path == "/answer":
+            correct = room.answer(params["player"], int(params["index"]), int(params["choice"]))
+            self.counters["answers"] += correct is not None
+            return 200, json.dumps({"accepted": correct is not None, "correct": correct}).encode()
+        if path == "/leave":
+            room.leave(params["player"])
+            if not room.players:
+                self.drop(room.name)
+            return 200, b'{"left": true}'
+        return 404, b'{"error": "not found"}'
+
+
+# Serve questions from stub_server's synthetic set instead of the API or the cache
+def synthetic_fetcher():
+    from stub_server import build_questions
+
+    by_category = {}
+    for (category, difficulty, qtype), questions in build_questions().items():
+        if qtype == "multiple":
+            by_category.setdefault(category, []).extend(questions)
+    def fetch(amount, category):
+        questions = by_category.get(category, [])
+        return random.sample(questions, min(amount, len(questions)))
+
+    return fetch
+
+
+# Let one process hold as many sockets as the hard limit allows
+def raise_fd_limit() -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def serve(host, port, server: GameServer):
+    listener = await asyncio.start_server(server.handle, host, port, backlog=4096)
+    host, port = listener.sockets[0].getsockname()[:2]
+    print(f"Serving trivia rooms at http://{host}:{port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multiplayer trivia rooms over HTTP long-polling")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--question-seconds", type=float, default=QUESTION_SECONDS)
+    parser.add_argument("--questions", type=int, default=QUESTIONS_PER_ROUND)
+    parser.add_argument("--synthetic", action="store_true", help="serve synthetic questions, no API or cache")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    game_server = GameServer(synthetic_fetcher() if args.synthetic else None, args.question_seconds, args.questions)
+    try:
+        asyncio.run(serve(args.host, args.port, game_server))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,232 @@
+import atexit
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Lightweight timing spans, counters and an event-loop lag monitor. Everything is off unless
+# TRIVIA_METRICS is set, in which case metrics are written to that path every EXPORT_INTERVAL seconds
+# (TRIVIA_METRICS_INTERVAL) and once more at exit: a .prom file gets Prometheus text format, anything
+# else gets one JSON line per export. When disabled, timed() returns the function unchanged and span()
+# hands back a shared no-op, so the hot paths pay nothing.
+#
+# TRIVIA_PROFILE=cprofile writes cProfile stats to trivia.prof at exit; TRIVIA_PROFILE=sample writes
+# collapsed stacks (flamegraph input) from a background sampler to trivia.stacks.
+
+METRICS_PATH = os.environ.get("TRIVIA_METRICS", "")
+ENABLED = bool(METRICS_PATH)
+PROFILE = os.environ.get("TRIVIA_PROFILE", "")
+
+RESERVOIR = 1024  # Recent samples kept per histogram for percentiles
+LAG_INTERVAL = 100  # Milliseconds between event-loop lag probes
+EXPORT_INTERVAL = float(os.environ.get("TRIVIA_METRICS_INTERVAL", "15"))  # Seconds between periodic exports
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+
+_lock = threading.Lock()
+_counters = collections.Counter()
+_histograms = {}  # name -> [count, total, max, deque of recent samples], times in milliseconds
+
+
+# Add a sample to a histogram
+def observe(name: str, ms: float) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = [0, 0.0, 0.0, collections.deque(maxlen=RESERVOIR)]
+        histogram[0] += 1
+        histogram[1] += ms
+        histogram[2] = max(histogram[2], ms)
+        histogram[3].append(ms)
+
+
+# Increment a counter
+def count(name: str, amount: int = 1) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] += amount
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# Time a block: `with span("fetch"): ...`
+def span(name: str):
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+# Time every call of a function; returns the function itself when metrics are off
+def timed(name: str):
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, (time.perf_counter() - start) * 1000)
+
+        return wrapper
+
+    return decorate
+
+
+# Probe the Tk event loop with `after` and record how late each probe fires
+def monitor_event_loop(widget, interval=LAG_INTERVAL) -> None:
+    if not ENABLED:
+        return
+
+    def probe(expected):
+        now = time.monotonic()
+        observe("tk_event_loop_lag", max(0.0, (now - expected) * 1000))
+        widget.after(interval, probe, now + interval / 1000)
+
+    widget.after(interval, probe, time.monotonic() + interval / 1000)
+
+
+# Return a point-in-time copy of every metric
+def snapshot() -> dict:
+    with _lock:
+        histograms = {}
+        for name, (samples, total, largest, recent) in _histograms.items():
+            ordered = sorted(recent)
+            histograms[name] = {
+                "count": samples,
+                "sum_ms": total,
+                "max_ms": largest,
+                "p50_ms": ordered[len(ordered) // 2],
+                "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+            }
+        return {"time": time.time(), "counters": dict(_counters), "histograms": histograms}
+
+
+# Append the current metrics as one JSON line
+def export_jsonl(path: str) -> None:
+    with open(path, "a") as metrics_file:
+        metrics_file.write(json.dumps(snapshot()) + "\n")
+
+
+# Write the current metrics in Prometheus text exposition format
+def export_prometheus(path: str) -> None:
+    data = snapshot()
+    lines = []
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"# TYPE trivia_{name}_total counter")
+        lines.append(f"trivia_{name}_total {value}")
+    for name, histogram in sorted(data["histograms"].items()):
+        lines.append(f"# TYPE trivia_{name}_ms summary")
+        lines.append(f'trivia_{name}_ms{{quantile="0.5"}} {histogram["p50_ms"]:.3f}')
+        lines.append(f'trivia_{name}_ms{{quantile="0.99"}} {histogram["p99_ms"]:.3f}')
+        lines.append(f"trivia_{name}_ms_sum {histogram['sum_ms']:.3f}")
+        lines.append(f"trivia_{name}_ms_count {histogram['count']}")
+    tmp = path + ".tmp"
+    with open(tmp, "w") as metrics_file:
+        metrics_file.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)  # Scrapers never see a half-written file
+
+
+# Export to TRIVIA_METRICS in the format its extension asks for
+def export(path: str = METRICS_PATH) -> None:
+    if path.endswith(".prom"):
+        export_prometheus(path)
+    else:
+        export_jsonl(path)
+
+
+# Export every `interval` seconds on a background thread, then once more at exit as a final flush
+def _start_exporter(interval=EXPORT_INTERVAL):
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                export()
+            except OSError:
+                pass  # Try again next interval; the final flush reports any lasting problem
+
+    exporter = threading.Thread(target=run, name="metrics-export", daemon=True)
+    exporter.start()
+
+    def flush():
+        stop.set()
+        exporter.join(timeout=1)
+        export()
+
+    atexit.register(flush)
+
+
+# Sample every thread's stack and count collapsed stacks until stopped
+def _sample_stacks(stop, stacks):
+    own = threading.get_ident()
+    while not stop.wait(SAMPLE_INTERVAL):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            names = []
+            while frame is not None:
+                names.append(f"{frame.f_code.co_filename.rsplit(os.sep, 1)[-1]}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+
+
+def _start_profiler():
+    if PROFILE == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        atexit.register(lambda: (profiler.disable(), profiler.dump_stats("trivia.prof")))
+    elif PROFILE == "sample":
+        stop = threading.Event()
+        stacks = collections.Counter()
+        sampler = threading.Thread(target=_sample_stacks, args=(stop, stacks), name="stack-sampler", daemon=True)
+        sampler.start()
+
+        def dump():
+            # Let the sampler finish its current pass before the counts are read
+            stop.set()
+            sampler.join()
+            with open("trivia.stacks", "w") as stacks_file:
+                for stack, samples in stacks.most_common():
+                    stacks_file.write(f"{stack} {samples}\n")
+
+        atexit.register(dump)
+
+
+if ENABLED:
+    _start_exporter()
+if PROFILE:
+    _start_profiler()
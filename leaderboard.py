@@ -0,0 +1,153 @@
+import heapq
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_LEADERBOARD_PATH = os.environ.get("TRIVIA_LEADERBOARD_PATH", "leaderboard.db")
+TOP_K = 10  # Entries kept per board
+SOLO = "solo"  # Mode of a regular game; adaptive games use adaptive.ADAPTIVE
+ALL_CATEGORIES = 0  # Category ID of the global board for a mode
+COMPACT_THRESHOLD = 100000  # Folded log rows before startup compaction kicks in
+
+
+# Leaderboard keeps an append-only score log in SQLite and a top-k heap per board in memory
+class Leaderboard:
+    def __init__(self, path=DEFAULT_LEADERBOARD_PATH, k=TOP_K, compact_threshold=COMPACT_THRESHOLD):
+        self.k = k
+        self.compact_threshold = compact_threshold
+        self._boards = {}  # (mode, category) -> min-heap of (score, -created_at, id, player, total, mode, category)
+        self._sorted = {}  # (mode, category) -> cached best-first rows for rendering
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")  # Appends survive a crash without blocking readers
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"  # IDs are never reused after compaction
+            " player TEXT NOT NULL,"
+            " mode TEXT NOT NULL,"
+            " category INTEGER NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " total INTEGER NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshot ("
+            " id INTEGER PRIMARY KEY,"
+            " player TEXT NOT NULL,"
+            " mode TEXT NOT NULL,"
+            " category INTEGER NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " total INTEGER NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._db.commit()
+        self.load()
+
+    # Rebuild the heaps from the last snapshot plus the log written since, then snapshot again
+    def load(self) -> None:
+        start = time.perf_counter()
+        snapshot_id = self._meta("snapshot_id")
+        for row in self._db.execute("SELECT id, player, mode, category, score, total, created_at FROM snapshot"):
+            self._push(*row)
+        tail = 0
+        for row in self._db.execute("SELECT id, player, mode, category, score, total, created_at FROM scores"
+                                    " WHERE id > ? ORDER BY id", (snapshot_id,)):
+            self._push(*row)
+            tail += 1
+        if tail:
+            self.snapshot()
+        if self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0] > self.compact_threshold:
+            self.compact()
+        self.load_ms = (time.perf_counter() - start) * 1000
+
+    # Append a finished game to the log and update the in-memory boards
+    def record(self, player: str, score: int, total: int, mode: str = SOLO, category: int = ALL_CATEGORIES) -> None:
+        now = time.time()
+        with self._lock:
+            with self._db:  # One transaction per score
+                row_id = self._db.execute(
+                    "INSERT INTO scores (player, mode, category, score, total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (player, mode, category, score, total, now)).lastrowid
+            self._push(row_id, player, mode, category, score, total, now)
+
+    # Best-first (player, score, total) rows for a board; cached until the board changes
+    def top(self, mode: str = SOLO, category: int = ALL_CATEGORIES) -> list:
+        key = (mode, category)
+        rows = self._sorted.get(key)
+        if rows is None:
+            with self._lock:
+                heap = self._boards.get(key, [])
+                rows = [(entry[3], entry[0], entry[4]) for entry in sorted(heap, reverse=True)]
+                self._sorted[key] = rows
+        return rows
+
+    # Persist every board's top-k and the log position they cover
+    def snapshot(self) -> None:
+        with self._lock:
+            last_id = max(self._meta("snapshot_id"),
+                          self._db.execute("SELECT COALESCE(MAX(id), 0) FROM scores").fetchone()[0])
+            # A row can sit on both its category board and the global board, so dedupe by id
+            rows = {}
+            for heap in self._boards.values():
+                for score, neg_created, row_id, player, total, mode, category in heap:
+                    rows[row_id] = (row_id, player, mode, category, score, total, -neg_created)
+            with self._db:
+                self._db.execute("DELETE FROM snapshot")
+                self._db.executemany("INSERT INTO snapshot VALUES (?, ?, ?, ?, ?, ?, ?)", rows.values())
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES ('snapshot_id', ?)", (last_id,))
+
+    # Drop log rows that are already covered by the snapshot
+    def compact(self) -> int:
+        with self._lock:
+            snapshot_id = self._meta("snapshot_id")
+            with self._db:
+                removed = self._db.execute("DELETE FROM scores WHERE id <= ?", (snapshot_id,)).rowcount
+        self._db.execute("VACUUM")
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    # Offer a row to its category board and to the global board for its mode
+    def _push(self, row_id, player, mode, category, score, total, created_at):
+        entry = (score, -created_at, row_id, player, total, mode, category)  # Ties go to the earlier score
+        for key in {(mode, category), (mode, ALL_CATEGORIES)}:
+            heap = self._boards.setdefault(key, [])
+            if len(heap) < self.k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+            self._sorted.pop(key, None)
+
+
+_default_leaderboard = None
+
+
+# Return the process-wide leaderboard
+def get_default_leaderboard() -> Leaderboard:
+    global _default_leaderboard
+    if _default_leaderboard is None:
+        _default_leaderboard = Leaderboard()
+    return _default_leaderboard
+
+
+# Main execution: print a board, e.g. `python leaderboard.py solo 18`
+if __name__ == "__main__":
+    board = get_default_leaderboard()
+    mode = sys.argv[1] if len(sys.argv) > 1 else SOLO
+    category = int(sys.argv[2]) if len(sys.argv) > 2 else ALL_CATEGORIES
+    print(f"Loaded in {board.load_ms:.1f} ms")
+    for rank, (player, score, total) in enumerate(board.top(mode, category), 1):
+        print(f"{rank:>2}. {player:<20} {score}/{total}")
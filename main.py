@@ -1,140 +1,35 @@
 import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-import requests
-import html
-import random
-
-# TriviaGame class manages the trivia game logic
-class TriviaGame:
-    def __init__(self, root, mobile_frame):
+from adaptive import ADAPTIVE
+from assets import get_photo, report_timings
+from instrumentation import monitor_event_loop
+from leaderboard import SOLO, get_default_leaderboard
+from question_bank import CATEGORIES, DIFFICULTIES
+from quiz import QuizController
+from timer import TIMED
+from widgets import AnswerButtonPool, FeedbackBanner, SelectionBar
+
+# TriviaGame lays out the quiz widgets on the main window; the game logic lives in QuizController
+class TriviaGame(QuizController):
+    def __init__(self, root):
         # Initialize the TriviaGame instance
+        QuizController.__init__(self, root)
         self.root = root
-        self.mobile_frame = mobile_frame
+        self.selection_bar = SelectionBar(root, CATEGORIES, DIFFICULTIES + (ADAPTIVE, TIMED), self.change_selection, self.category)
+        self.selection_bar.pack(pady=(10, 0))
         self.question_label = tk.Label(root, wraplength=400, font=("Arial", 12))
         self.question_label.pack(pady=40)  # Add more padding at the top
-        self.choices = []
-        self.correct_answer = None
-        self.question_index = 0
+        self.answer_buttons = AnswerButtonPool(root, self.check_answer)
+        self.feedback = FeedbackBanner(root)  # Inline result of the last answer
+        self.timer_label = tk.Label(root, font=("Helvetica", 14))  # Placed in timed mode only
         self.play_game()
 
-    # Fetch a pool of questions from the Open Trivia Database API
-    def get_question_pool(self, amount: int, category: int) -> list:
-        # Construct the API URL
-        url = f"https://opentdb.com/api.php?amount={amount}&category={category}"
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Check for any HTTP errors
-            data = response.json()
-            if 'results' in data:
-                return data["results"]
-            else:
-                print("Unexpected response format:")
-                print(data)
-                return []
-        except requests.exceptions.HTTPError as err:
-            print(f"HTTP error occurred: {err}")
-            return []
-        except requests.exceptions.RequestException as e:
-            print(f"Request error occurred: {e}")
-            return []
-
-    # Shuffle the answers for a given question
-    def shuffle_answers(self, question: dict) -> dict:
-        answers = question["incorrect_answers"] + [question["correct_answer"]]
-        random.shuffle(answers)
-        question["shuffled_answers"] = answers
-        return question
-
-    # Print the current question and its choices to the screen
-    def print_question(self, question: dict) -> None:
-        # Display the question text
-        self.correct_answer = question["correct_answer"]
-        self.question_label.config(text=html.unescape(question["question"]))
-        shuffled_answers = question["shuffled_answers"]
-
-        # Destroy existing choice buttons
-        for choice in self.choices:
-            choice.destroy()
-        self.choices = []
-
-        # Create buttons for each answer choice
-        num_choices = len(shuffled_answers)
-        for i in range(num_choices):
-            answer_text = html.unescape(shuffled_answers[i])
-            button_width = 50  # Fixed width for better layout
-            choice = tk.Button(self.root, text=f"{i+1}. {answer_text}", width=button_width, command=lambda i=i: self.check_answer(i))
-            choice.pack(pady=5)
-            self.choices.append(choice)
-
-        # Check if the current question has a user_answer and update the UI accordingly
-        if question.get("user_answer") is not None:
-            user_choice = int(question["user_answer"]) - 1
-            self.choices[user_choice].config(bg="light green")  # Highlight the user's choice
-
-            # Disable all buttons after user has answered
-            for i in range(num_choices):
-                if i != user_choice:
-                    self.choices[i].config(state=tk.DISABLED)
-
-    # Finish the game and restart if desired
-    def finish_game(self):
-        messagebox.showinfo("Game Over", "Game finished!")
-
-        # Destroy the choice buttons
-        for choice in self.choices:
-            choice.destroy()
-        self.choices = []
-
-        # Recreate the app window
-        self.mobile_frame.destroy()
-        app = MobileFrame()
-        app.mainloop()
-
-    # Restart the game
-    def restart_game(self):
-        # Reset question index and clear user answers
-        self.question_index = 0
-        for question in self.questions:
-            question["user_answer"] = None
-
-        # Destroy the restart button
-        self.root.pack_forget()
-
-        # Restart the game
-        self.play_game()
-
-    # Check the user's answer and display the correct answer
-    def check_answer(self, choice: int):
-        user_choice = str(choice + 1)
-        current_question = self.questions[self.question_index]
-        current_question["user_answer"] = user_choice
-
-        correct_answer = html.unescape(current_question["correct_answer"])
-        messagebox.showinfo("Result", f"The correct answer is: {correct_answer}")
-
-        self.question_index += 1
-        if self.question_index < len(self.questions):
-            # Destroy the choice buttons
-            for choice in self.choices:
-                choice.destroy()
-            self.choices = []
-
-            self.print_question(self.questions[self.question_index])
-        else:
-            self.finish_game()
-
-    # Start the game
-    def play_game(self):
-        amount = 4  # Number of questions
-        category = 18  # Category ID (Computer Science)
-        self.questions = self.get_question_pool(amount, category)
-        if not self.questions:
-            messagebox.showerror("Error", "Failed to fetch questions. Please try again later.")
-            self.mobile_frame.destroy()
-            return
-        self.questions = [self.shuffle_answers(q) for q in self.questions]
-        self.print_question(self.questions[self.question_index])
+    # Bring the game's widgets back above the content frame
+    def lift(self):
+        self.selection_bar.lift()
+        self.question_label.lift()
+        self.timer_label.lift()
+        for button in self.answer_buttons.buttons:
+            button.lift()
 
 # MobileFrame class represents the main application window
 class MobileFrame(tk.Tk):
@@ -152,11 +47,14 @@ class MobileFrame(tk.Tk):
         self.create_content()
 
         if self.selected_menu_item == "Quiz":
-            self.trivia_game = TriviaGame(self, self)
+            self.trivia_game = TriviaGame(self)
 
         # Create profile image
         self.create_profile_image()
 
+        # Record event-loop lag when TRIVIA_METRICS is set
+        monitor_event_loop(self)
+
     # Create the menu buttons
     def create_menu(self):
         # Create and place the menu frame
@@ -168,7 +66,7 @@ class MobileFrame(tk.Tk):
         menu_label.pack(pady=10)
 
         # Define menu items
-        menu_items = ["Quiz", "About", "Exit"]
+        menu_items = ["Quiz", "About", "Leaderboard", "Exit"]
 
         # Create buttons for each menu item
         for item in menu_items:
@@ -178,6 +76,9 @@ class MobileFrame(tk.Tk):
 
     # Create the content based on the selected menu item
     def create_content(self):
+        # Replace the previous content rather than stacking frames on top of it
+        if getattr(self, "content_frame", None) is not None:
+            self.content_frame.destroy()
         self.content_frame = tk.Frame(self, bg="light blue")  # Set the background color to light blue
         self.content_frame.place(relx=0.2, rely=0, relwidth=0.8, relheight=1)
 
@@ -212,13 +113,21 @@ class MobileFrame(tk.Tk):
 
             # Disable text widget editing
             text_widget.config(state=tk.DISABLED)
+        elif self.selected_menu_item == "Leaderboard":
+            # Show the best scores of each mode side by side, already sorted in memory by the leaderboard
+            for mode in (SOLO, ADAPTIVE, TIMED):
+                column = tk.Frame(self.content_frame, bg="light blue")
+                column.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+                title = tk.Label(column, text=f"{mode.title()} Leaderboard", font=("Helvetica", 14), bg="light blue")
+                title.pack(pady=(10, 0))
+                for rank, (player, score, total) in enumerate(get_default_leaderboard().top(mode)[:5], 1):
+                    row = tk.Label(column, text=f"{rank}. {player}  {score}/{total}", bg="light blue")
+                    row.pack()
 
     # Create and display the profile image
     def create_profile_image(self):
-        # Load and resize the image
-        image = Image.open("profile.jpg")
-        image = image.resize((50, 50), Image.LANCZOS)
-        photo = ImageTk.PhotoImage(image)
+        # Load the shared, pre-scaled image
+        photo = get_photo(self, "profile.jpg", (50, 50))
 
         # Create a label to display the image
         image_label = tk.Label(self, image=photo)
@@ -231,16 +140,31 @@ class MobileFrame(tk.Tk):
             self.selected_menu_item = "Quiz"
             self.create_content()
             if hasattr(self, 'trivia_game') and self.trivia_game is not None:
-                self.trivia_game = None  # Destroy the existing TriviaGame object
-            self.trivia_game = TriviaGame(self, self)
+                # Reuse the existing game and its widgets instead of building another one
+                self.trivia_game.lift()
+                self.trivia_game.resume()
+                self.trivia_game.restart_game()
+            else:
+                self.trivia_game = TriviaGame(self)
         elif item == "About":
             self.selected_menu_item = "About"
             self.create_content()
+            self.pause_game()
+        elif item == "Leaderboard":
+            self.selected_menu_item = "Leaderboard"
+            self.create_content()
+            self.pause_game()
 
         elif item == "Exit":
             self.destroy()
 
+    # Stop the quiz clock while another page covers the game
+    def pause_game(self):
+        if getattr(self, "trivia_game", None) is not None:
+            self.trivia_game.pause()
+
 # Main execution
 if __name__ == "__main__":
     app = MobileFrame()
+    report_timings()
     app.mainloop()
@@ -0,0 +1,78 @@
+import queue
+import threading
+
+DEFAULT_DEPTH = 2  # Number of ready-to-play batches kept ahead of the current game
+POLL_INTERVAL = 50  # Milliseconds between checks of the ready queue from the Tk thread
+RETRY_DELAY = 5.0  # Seconds to wait before fetching again after a failed batch
+
+
+# BatchPrefetcher keeps a bounded queue of shuffled question batches filled on a worker thread
+class BatchPrefetcher:
+    def __init__(self, fetch_batch, depth=DEFAULT_DEPTH, retry_delay=RETRY_DELAY):
+        # fetch_batch() returns a list of ready-to-play (already shuffled) questions, or [] on failure
+        self.fetch_batch = fetch_batch
+        self.retry_delay = retry_delay
+        self.failed = False  # Set while the most recent fetch came back empty
+        self._generation = 0  # Bumped whenever a waiting when_ready callback is replaced or cancelled
+
+        self._ready = queue.Queue(maxsize=depth)
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="question-prefetch", daemon=True)
+        self._worker.start()
+
+    # Take a ready batch without blocking, or None if nothing has arrived yet
+    def pop(self):
+        try:
+            return self._ready.get_nowait()
+        except queue.Empty:
+            return None
+
+    # Poll from the Tk event loop with `after` and hand the next non-empty batch to callback.
+    # A failed fetch does not end the wait: the worker retries after retry_delay, and on_retry()
+    # is called once each time the wait runs into a failure so the UI can say so.
+    def when_ready(self, widget, callback, interval=POLL_INTERVAL, on_retry=None) -> None:
+        # Only the newest request is served; older poll loops see the generation change and exit
+        self._generation += 1
+        generation = self._generation
+        retrying = False
+
+        def poll():
+            nonlocal retrying
+            if self._stopped.is_set() or generation != self._generation:
+                return
+            batch = self.pop()
+            if batch is None:
+                if self.failed != retrying:
+                    retrying = self.failed
+                    if retrying and on_retry is not None:
+                        on_retry()
+                widget.after(interval, poll)
+                return
+            self._generation += 1
+            callback(batch)
+
+        poll()
+
+    # Drop any callback still waiting in when_ready
+    def cancel(self) -> None:
+        self._generation += 1
+
+    # Stop the worker; batches already queued are dropped
+    def stop(self) -> None:
+        self._stopped.set()
+
+    # Worker loop: fetch, then block until the queue has room for the batch
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self.fetch_batch()
+            if not batch:
+                self.failed = True
+                self._stopped.wait(self.retry_delay)
+                continue
+            self.failed = False
+            while not self._stopped.is_set():
+                try:
+                    self._ready.put(batch, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
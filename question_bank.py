@@ -0,0 +1,204 @@
+import functools
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import ingest
+
+# Open Trivia Database category IDs and names
+CATEGORIES = {
+    9: "General Knowledge",
+    10: "Entertainment: Books",
+    11: "Entertainment: Film",
+    12: "Entertainment: Music",
+    13: "Entertainment: Musicals & Theatres",
+    14: "Entertainment: Television",
+    15: "Entertainment: Video Games",
+    16: "Entertainment: Board Games",
+    17: "Science & Nature",
+    18: "Science: Computers",
+    19: "Science: Mathematics",
+    20: "Mythology",
+    21: "Sports",
+    22: "Geography",
+    23: "History",
+    24: "Politics",
+    25: "Art",
+    26: "Celebrities",
+    27: "Animals",
+    28: "Vehicles",
+    29: "Entertainment: Comics",
+    30: "Science: Gadgets",
+    31: "Entertainment: Japanese Anime & Manga",
+    32: "Entertainment: Cartoon & Animations",
+}
+DIFFICULTIES = ("easy", "medium", "hard")
+PER_REQUEST = 50  # Largest amount the API serves in one request
+MAX_PRELOAD_WORKERS = 8
+
+
+# Preload workers: one for opentdb.com, where its one-request-per-5s limit would only queue more, and
+# several for a question pack, an offline cache or a stand-in allowing more requests per second
+# (TRIVIA_API_RATE). TRIVIA_PRELOAD_WORKERS overrides the choice. Read when a preload starts, so
+# settings made after import still apply.
+def preload_workers() -> int:
+    if os.environ.get("TRIVIA_PRELOAD_WORKERS"):
+        return max(1, int(os.environ["TRIVIA_PRELOAD_WORKERS"]))
+    offline = os.environ.get("TRIVIA_OFFLINE", "") not in ("", "0") or "--offline" in sys.argv
+    if offline or os.environ.get("TRIVIA_QUESTION_PACK"):
+        return MAX_PRELOAD_WORKERS
+    from trivia_client import DEFAULT_RATE
+    return min(MAX_PRELOAD_WORKERS, max(1, int(DEFAULT_RATE)))
+
+
+# _Pool is one index bucket; questions before `cursor` have been drawn in the current cycle
+class _Pool:
+    __slots__ = ("questions", "cursor")
+
+    def __init__(self):
+        self.questions = []
+        self.cursor = 0
+
+    # Draw `amount` distinct questions in O(amount) with a partial Fisher-Yates shuffle.
+    # Questions for which skip(question) is true are passed over for this cycle, so fewer may come back.
+    def draw(self, amount: int, rng, skip=None) -> list:
+        questions = self.questions
+        size = len(questions)
+        amount = min(amount, size)
+        if size - self.cursor < amount:
+            self.cursor = 0  # Everything has been drawn once, so start a new cycle
+        drawn = []
+        while len(drawn) < amount and self.cursor < size:
+            j = rng.randrange(self.cursor, size)
+            questions[self.cursor], questions[j] = questions[j], questions[self.cursor]
+            question = questions[self.cursor]
+            self.cursor += 1
+            if skip is None or not skip(question):
+                drawn.append(question)
+        return drawn
+
+
+# Every index key a question belongs to; None stands for "any"
+def _keys(category, difficulty, qtype):
+    for c in (category, None):
+        for d in (difficulty, None):
+            for t in (qtype, None):
+                yield c, d, t
+
+
+# QuestionBank holds preloaded questions indexed by (category, difficulty, type)
+class QuestionBank:
+    def __init__(self, fetcher=None, rng=random):
+        # fetcher(amount, category, difficulty, qtype) returns raw API results; defaults to the question cache
+        self.fetcher = fetcher
+        self.rng = rng
+        self._index = {}
+        self._seen = set()  # Hashes of (category, text) already in the bank
+        self._preloader = None  # Thread started by preload_async
+        self._lock = threading.Lock()
+
+    # Ingest raw API results for a category, skipping duplicates
+    def add(self, results: list, category: int) -> int:
+        questions = ingest(results, self.rng)
+        added = 0
+        with self._lock:
+            for question in questions:
+                fingerprint = hash((category, question.text))
+                if fingerprint in self._seen:
+                    continue
+                self._seen.add(fingerprint)
+                for key in _keys(category, question.difficulty, question.type):
+                    pool = self._index.get(key)
+                    if pool is None:
+                        pool = self._index[key] = _Pool()
+                    pool.questions.append(question)
+                added += 1
+        return added
+
+    # Draw up to `amount` distinct questions; any filter left as None matches everything, and
+    # skip(question), e.g. a player's seen filter, rejects individual questions
+    def draw(self, amount: int, category: int = None, difficulty: str = None, qtype: str = None, skip=None) -> list:
+        with self._lock:
+            pool = self._index.get((category, difficulty, qtype))
+            return pool.draw(amount, self.rng, skip) if pool is not None else []
+
+    # Number of questions stored under a key
+    def count(self, category: int = None, difficulty: str = None, qtype: str = None) -> int:
+        pool = self._index.get((category, difficulty, qtype))
+        return len(pool.questions) if pool is not None else 0
+
+    # Category IDs that currently have questions, in ID order
+    def categories(self) -> list:
+        with self._lock:
+            return sorted(key[0] for key in self._index if key[0] is not None and key[1] is None and key[2] is None)
+
+    def __len__(self):
+        return self.count()
+
+    # Fetch every category/difficulty pair `rounds` times, `workers` at a time (default: preload_workers());
+    # returns the number of questions added
+    def preload(self, categories=CATEGORIES, difficulties=DIFFICULTIES, per_key=PER_REQUEST, rounds=1,
+                workers=None) -> int:
+        if workers is None:
+            workers = preload_workers()
+        fetcher = self.fetcher
+        if fetcher is None:
+            from question_cache import get_default_cache
+            fetcher = functools.partial(get_default_cache().get, refill=False)
+
+        def load(job):
+            category, difficulty = job
+            return self.add(fetcher(per_key, category, difficulty, None), category)
+
+        jobs = [(category, difficulty) for _ in range(rounds) for category in categories for difficulty in difficulties]
+        if workers <= 1:
+            return sum(map(load, jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank-preload") as pool:
+            return sum(pool.map(load, jobs))
+
+    # Preload on a background thread so the UI can start straight away; later calls return the same thread
+    def preload_async(self, *args, **kwargs) -> threading.Thread:
+        with self._lock:
+            if self._preloader is None:
+                self._preloader = threading.Thread(target=self.preload, args=args, kwargs=kwargs, name="bank-preload",
+                                                   daemon=True)
+                self._preloader.start()
+            return self._preloader
+
+
+_default_bank = None
+_default_lock = threading.Lock()
+
+
+# Return the process-wide bank. It starts empty: callers start the preload with preload_async() once
+# their first game is under way, so the preload does not compete with that game's fetch.
+def get_default_bank() -> QuestionBank:
+    global _default_bank
+    with _default_lock:
+        if _default_bank is None:
+            _default_bank = QuestionBank()
+        return _default_bank
+
+
+# Main execution: preload every category and report size and draw speed
+if __name__ == "__main__":
+    import tracemalloc
+
+    categories = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or list(CATEGORIES)
+    tracemalloc.start()
+    bank = QuestionBank()
+    start = time.perf_counter()
+    added = bank.preload(categories, rounds=int(os.environ.get("PRELOAD_ROUNDS", "1")))
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    print(f"Preloaded {added} questions from {len(categories)} categories in {elapsed:.2f}s "
+          f"with {preload_workers()} workers ({memory / max(added, 1):.0f} bytes per question)")
+
+    start = time.perf_counter()
+    draws = 100000
+    for _ in range(draws):
+        bank.draw(4, random.choice(categories))
+    print(f"{(time.perf_counter() - start) / draws * 1e6:.2f} us per 4-question draw")
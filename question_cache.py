@@ -0,0 +1,220 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import instrumentation
+from trivia_client import get_default_client
+
+# Default location and limits for the local question store
+DEFAULT_CACHE_PATH = os.environ.get("TRIVIA_CACHE_PATH", "question_cache.db")
+DEFAULT_TTL = 24 * 60 * 60  # Questions are considered fresh for a day
+# Size bound before least-recently-used rows are evicted: room for a full bank preload
+# (24 categories x 3 difficulties x 50 = 3600 rows) plus the refills of the keys being played
+DEFAULT_MAX_ENTRIES = 5000
+REFILL_FACTOR = 3  # Refill in the background once fewer than this many games remain fresh
+
+
+# QuestionCache keeps fetched questions in SQLite so games can start without the API
+class QuestionCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES,
+                 offline=False, fetcher=None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.offline = offline
+        self.fetcher = fetcher or get_default_client().fetch  # Called as fetcher(amount, category, difficulty, qtype)
+        self.counters = {"hits": 0, "misses": 0, "stale_hits": 0, "refills": 0, "evictions": 0,
+                         "preload_hits": 0, "preload_misses": 0, "preload_stale_hits": 0}
+
+        self._lock = threading.Lock()
+        self._refilling = set()  # Keys with a background refill in flight
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            " question TEXT NOT NULL,"
+            " category INTEGER NOT NULL,"
+            " difficulty TEXT NOT NULL,"
+            " type TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (category, difficulty, type, question))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS questions_lru ON questions (last_used)")
+        self._db.commit()
+
+    # Return up to `amount` questions, serving from the cache first. Bulk reads such as the bank
+    # preload pass refill=False: they are not games, so they trigger no background refills and are
+    # counted under preload_* instead of the hit and miss counters used to size the cache.
+    def get(self, amount: int, category: int, difficulty: str = None, qtype: str = None, refill=True) -> list:
+        prefix = "" if refill else "preload_"
+        now = time.time()
+        fresh = self._select(amount, category, difficulty, qtype, now - self.ttl)
+        if len(fresh) >= amount:
+            self._count(prefix + "hits")
+            self._touch(fresh, now)
+            if refill and self._count_rows(category, difficulty, qtype, now - self.ttl) < amount * REFILL_FACTOR:
+                self.refill_async(amount, category, difficulty, qtype)
+            return [json.loads(row[1]) for row in fresh]
+
+        if self.offline:
+            # Offline kiosks play whatever is stored, however old it is
+            stale = self._select(amount, category, difficulty, qtype, None)
+            self._count(prefix + ("stale_hits" if stale else "misses"))
+            self._touch(stale, now)
+            return [json.loads(row[1]) for row in stale]
+
+        self._count(prefix + "misses")
+        questions = self.fetcher(amount, category, difficulty, qtype)
+        if questions:
+            self.store(questions, category)
+            return questions
+
+        # The API failed, so fall back to stale questions rather than no game at all
+        stale = self._select(amount, category, difficulty, qtype, None)
+        if len(stale) >= amount:
+            self._count(prefix + "stale_hits")
+            self._touch(stale, now)
+            return [json.loads(row[1]) for row in stale]
+        return []
+
+    # Insert fetched questions and evict anything over the size bound
+    def store(self, questions: list, category: int) -> None:
+        now = time.time()
+        rows = [(q["question"], category, q.get("difficulty", ""), q.get("type", ""), json.dumps(q), now, now)
+                for q in questions]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO questions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._evict(now)
+            self._db.commit()
+
+    # Top the cache up for a key on a worker thread without blocking the caller
+    def refill_async(self, amount: int, category: int, difficulty: str = None, qtype: str = None) -> None:
+        if self.offline:
+            return
+        key = (category, difficulty, qtype)
+        with self._lock:
+            if key in self._refilling:
+                return
+            self._refilling.add(key)
+
+        def refill():
+            try:
+                questions = self.fetcher(amount, category, difficulty, qtype)
+                if questions:
+                    self.store(questions, category)
+                    self._count("refills")
+            finally:
+                with self._lock:
+                    self._refilling.discard(key)
+
+        threading.Thread(target=refill, daemon=True).start()
+
+    # Return a snapshot of the hit/miss counters and the current size
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+            stats = dict(self.counters)
+        stats["size"] = size
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # Count the rows stored for a key, optionally only those fetched after `since`
+    def _count_rows(self, category, difficulty, qtype, since):
+        sql, args = self._where(category, difficulty, qtype, since)
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM questions" + sql, args).fetchone()[0]
+
+    # Build the WHERE clause shared by lookups and counts
+    def _where(self, category, difficulty, qtype, since):
+        sql = " WHERE category = ?"
+        args = [category]
+        if difficulty:
+            sql += " AND difficulty = ?"
+            args.append(difficulty)
+        if qtype:
+            sql += " AND type = ?"
+            args.append(qtype)
+        if since is not None:
+            sql += " AND fetched_at > ?"
+            args.append(since)
+        return sql, args
+
+    # Pick random rows for a key, optionally only those fetched after `since`
+    def _select(self, amount, category, difficulty, qtype, since):
+        sql, args = self._where(category, difficulty, qtype, since)
+        args.append(amount)
+        with self._lock:
+            return self._db.execute("SELECT rowid, payload FROM questions" + sql + " ORDER BY RANDOM() LIMIT ?",
+                                    args).fetchall()
+
+    # Mark rows as recently used so LRU eviction keeps them
+    def _touch(self, rows, now):
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany("UPDATE questions SET last_used = ? WHERE rowid = ?", [(now, row[0]) for row in rows])
+            self._db.commit()
+
+    # Trim to max_entries under size pressure, expired rows first, then by last use. Expired rows are
+    # otherwise kept: get() only serves them when the API fails, and they are better than no game.
+    def _evict(self, now):
+        size = self._db.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+        if size <= self.max_entries:
+            return
+        self.counters["evictions"] += self._db.execute(
+            "DELETE FROM questions WHERE rowid IN"
+            " (SELECT rowid FROM questions ORDER BY fetched_at > ?, last_used LIMIT ?)",
+            (now - self.ttl, size - self.max_entries)).rowcount
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+        instrumentation.count(f"cache_{name}")
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+# Return the process-wide cache, honouring TRIVIA_OFFLINE=1 for kiosks with no network and
+# TRIVIA_QUESTION_PACK=<path> to fill it from an offline pack (see question_pack.py) instead of the API
+def get_default_cache() -> QuestionCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            offline = os.environ.get("TRIVIA_OFFLINE", "") not in ("", "0") or "--offline" in sys.argv
+            fetcher = None
+            pack_path = os.environ.get("TRIVIA_QUESTION_PACK")
+            if pack_path:
+                from question_pack import QuestionPack
+                fetcher = QuestionPack(pack_path).fetch
+            _default_cache = QuestionCache(offline=offline, fetcher=fetcher)
+        return _default_cache
+
+
+# Report the cache counters and size, e.g. when a game finishes
+def report_stats(cache: QuestionCache = None) -> None:
+    cache = cache or get_default_cache()
+    stats = cache.stats()
+    print("Question cache: {hits} hits, {stale_hits} stale hits, {misses} misses, "
+          "{refills} refills, {evictions} evictions, {size} stored ({hit_rate:.0%} hit rate); "
+          "preload: {preload_hits} hits, {preload_stale_hits} stale hits, {preload_misses} misses".format(**stats))
+
+
+# Main execution: warm the cache for kiosks before taking them offline
+if __name__ == "__main__":
+    cache = get_default_cache()
+    categories = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or [18]
+    for category in categories:
+        cache.store(cache.fetcher(50, category, None, None), category)
+    report_stats(cache)
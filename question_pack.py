@@ -0,0 +1,251 @@
+import argparse
+import bisect
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+from question_bank import CATEGORIES, DIFFICULTIES
+
+# Offline question packs: one memory-mapped file of length-prefixed records plus an offset index and
+# per-(category, difficulty, type) posting lists, so a kiosk can hold 100k+ questions without parsing
+# them up front. Records keep OpenTDB's raw, HTML-escaped strings and are decoded one at a time into
+# the same dicts the API returns, so a pack can stand in anywhere a fetcher is expected.
+#
+#   header    MAGIC, u16 version, u16 key count, u32 record count, u64 index offset, u32 reserved
+#             (written as 0 and ignored by readers; it pads the header to 24 bytes)
+#   records   u32 length + (u8 category, u8 difficulty, u8 type, u8 incorrect count, u16-prefixed strings)
+#   index     u64 offset per record, then the key table, then u32 record numbers grouped by key
+
+MAGIC = b"TQPK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQI")  # magic, version, key count, record count, index offset, reserved
+RECORD_LENGTH = struct.Struct("<I")
+RECORD_HEAD = struct.Struct("<BBBB")
+STRING_LENGTH = struct.Struct("<H")
+KEY = struct.Struct("<BBBxII")  # category, difficulty, type, first posting, posting count
+TYPES = ("multiple", "boolean")
+CATEGORY_IDS = {name: category for category, name in CATEGORIES.items()}
+
+
+def _code(values, value) -> int:
+    return values.index(value) + 1 if value in values else 0
+
+
+# Pack one raw result into a record payload
+def _encode(raw: dict, category: int) -> bytes:
+    strings = [raw["question"], raw["correct_answer"], *raw["incorrect_answers"]]
+    parts = [RECORD_HEAD.pack(category, _code(DIFFICULTIES, raw.get("difficulty")), _code(TYPES, raw.get("type")),
+                              len(strings) - 2)]
+    for string in strings:
+        data = string.encode()
+        parts.append(STRING_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+# Yield raw results from JSONL lines holding either whole API responses or single questions
+def _read_jsonl(lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        data = json.loads(line)
+        if "results" in data:
+            yield from data["results"]
+        else:
+            yield data
+
+
+# Stream raw results into a pack at `path`; returns the number of questions written.
+# Memory stays constant: records are written as they arrive, then the index is filled in place
+# through a memory map in a second pass over the file.
+def write_pack(path: str, results, category: int = None) -> int:
+    counts = {}  # (category, difficulty, type) -> records; at most one entry per OpenTDB key
+    tmp = path + ".tmp"
+    with open(tmp, "w+b") as pack:
+        pack.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0))
+        records = 0
+        for raw in results:
+            record_category = category if category is not None else CATEGORY_IDS.get(raw.get("category"), 0)
+            payload = _encode(raw, record_category)
+            pack.write(RECORD_LENGTH.pack(len(payload)))
+            pack.write(payload)
+            key = RECORD_HEAD.unpack_from(payload)[:3]
+            counts[key] = counts.get(key, 0) + 1
+            records += 1
+
+        index_offset = -(-pack.tell() // 8) * 8
+        keys_offset = index_offset + 8 * records
+        postings_offset = keys_offset + KEY.size * len(counts)
+        size = postings_offset + 4 * records
+        pack.truncate(size)
+        pack.seek(0)
+        pack.write(HEADER.pack(MAGIC, VERSION, len(counts), records, index_offset, 0))
+        pack.flush()
+
+        starts = {}
+        start = 0
+        for i, key in enumerate(sorted(counts)):
+            starts[key] = start
+            pack.seek(keys_offset + KEY.size * i)
+            pack.write(KEY.pack(*key, start, counts[key]))
+            start += counts[key]
+        pack.flush()
+
+        if records:
+            with mmap.mmap(pack.fileno(), size) as view:
+                position = HEADER.size
+                for record in range(records):
+                    struct.pack_into("<Q", view, index_offset + 8 * record, position)
+                    key = RECORD_HEAD.unpack_from(view, position + RECORD_LENGTH.size)[:3]
+                    struct.pack_into("<I", view, postings_offset + 4 * starts[key], record)
+                    starts[key] += 1
+                    position += RECORD_LENGTH.size + RECORD_LENGTH.unpack_from(view, position)[0]
+    os.replace(tmp, path)
+    return records
+
+
+# QuestionPack reads a pack lazily through a read-only memory map
+class QuestionPack:
+    def __init__(self, path: str, rng=random):
+        self.path = path
+        self.rng = rng
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, key_count, self.records, index_offset, _ = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} question pack")
+        view = memoryview(self._map)
+        keys_offset = index_offset + 8 * self.records
+        postings_offset = keys_offset + KEY.size * key_count
+        self._offsets = view[index_offset:keys_offset].cast("Q")
+        self._postings = view[postings_offset:postings_offset + 4 * self.records].cast("I")
+        self._keys = {}  # (category, difficulty code, type code) -> (first posting, count)
+        for i in range(key_count):
+            category, difficulty, qtype, first, count = KEY.unpack_from(self._map, keys_offset + KEY.size * i)
+            self._keys[category, difficulty, qtype] = (first, count)
+
+    def __len__(self):
+        return self.records
+
+    # Decode record i into an API-style result dict
+    def __getitem__(self, i: int) -> dict:
+        position = self._offsets[i] + RECORD_LENGTH.size
+        category, difficulty, qtype, incorrect = RECORD_HEAD.unpack_from(self._map, position)
+        position += RECORD_HEAD.size
+        strings = []
+        for _ in range(incorrect + 2):
+            length = STRING_LENGTH.unpack_from(self._map, position)[0]
+            position += STRING_LENGTH.size
+            strings.append(self._map[position:position + length].decode())
+            position += length
+        return {
+            "type": TYPES[qtype - 1] if qtype else "",
+            "difficulty": DIFFICULTIES[difficulty - 1] if difficulty else "",
+            "category": CATEGORIES.get(category, ""),
+            "question": strings[0],
+            "correct_answer": strings[1],
+            "incorrect_answers": strings[2:],
+        }
+
+    def __iter__(self):
+        for i in range(self.records):
+            yield self[i]
+
+    # Posting spans matching a query; any filter left as None matches everything
+    def _spans(self, category, difficulty, qtype):
+        difficulty = None if difficulty is None else _code(DIFFICULTIES, difficulty)
+        qtype = None if qtype is None else _code(TYPES, qtype)
+        return [span for (c, d, t), span in self._keys.items()
+                if (category is None or c == category) and (difficulty is None or d == difficulty)
+                and (qtype is None or t == qtype)]
+
+    def count(self, category: int = None, difficulty: str = None, qtype: str = None) -> int:
+        return sum(count for _, count in self._spans(category, difficulty, qtype))
+
+    # Record numbers matching a query, read straight from the posting lists
+    def select(self, category: int = None, difficulty: str = None, qtype: str = None):
+        for first, count in self._spans(category, difficulty, qtype):
+            yield from self._postings[first:first + count]
+
+    # Decode `amount` random matching questions; same signature as TriviaClient.fetch
+    def fetch(self, amount: int, category: int = None, difficulty: str = None, qtype: str = None) -> list:
+        spans = self._spans(category, difficulty, qtype)
+        ends = []
+        total = 0
+        for _, count in spans:
+            total += count
+            ends.append(total)
+        picks = self.rng.sample(range(total), min(amount, total))
+        results = []
+        for pick in picks:
+            span = bisect.bisect_right(ends, pick)
+            first, count = spans[span]
+            results.append(self[self._postings[first + pick - (ends[span] - count)]])
+        return results
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._postings.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Stream a pack back out as one API-style question per JSONL line; returns the number written
+def export_jsonl(pack: QuestionPack, out) -> int:
+    written = 0
+    for raw in pack:
+        out.write(json.dumps(raw) + "\n")
+        written += 1
+    return written
+
+
+# Main execution: `python question_pack.py import in.jsonl out.pack` or `export in.pack out.jsonl`
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and inspect offline question packs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("import", help="convert OpenTDB JSONL (responses or questions) into a pack")
+    build.add_argument("source", help="JSONL file, or - for stdin")
+    build.add_argument("pack")
+    build.add_argument("--category", type=int, help="category ID for every question instead of its name")
+    dump = commands.add_parser("export", help="write a pack back out as JSONL")
+    dump.add_argument("pack")
+    dump.add_argument("target", help="JSONL file, or - for stdout")
+    info = commands.add_parser("info", help="print counts and lookup speed")
+    info.add_argument("pack")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        start = time.perf_counter()
+        source = sys.stdin if args.source == "-" else open(args.source)
+        with source:
+            written = write_pack(args.pack, _read_jsonl(source), args.category)
+        print(f"Packed {written} questions into {args.pack} in {time.perf_counter() - start:.2f}s "
+              f"({os.path.getsize(args.pack) / max(written, 1):.0f} bytes per question)")
+    elif args.command == "export":
+        with QuestionPack(args.pack) as pack:
+            target = sys.stdout if args.target == "-" else open(args.target, "w")
+            with target:
+                export_jsonl(pack, target)
+    else:
+        start = time.perf_counter()
+        with QuestionPack(args.pack) as pack:
+            opened = time.perf_counter() - start
+            print(f"{len(pack)} questions, opened in {opened * 1000:.2f} ms")
+            for category in sorted({key[0] for key in pack._keys}):
+                print(f"{category:>3} {CATEGORIES.get(category, 'Unknown'):<40} {pack.count(category)}")
+            draws = 10000
+            start = time.perf_counter()
+            for _ in range(draws):
+                pack.fetch(4, 18)
+            print(f"{(time.perf_counter() - start) / draws * 1e6:.2f} us per 4-question fetch")
@@ -0,0 +1,241 @@
+import time
+import tkinter as tk
+from adaptive import ADAPTIVE, AdaptiveScheduler, get_rating
+from engine import GameEngine, Question, ingest
+from instrumentation import timed
+from leaderboard import SOLO, get_default_leaderboard
+from prefetch import POLL_INTERVAL, BatchPrefetcher
+from question_bank import PER_REQUEST, get_default_bank
+from question_cache import get_default_cache, report_stats
+from seen_filter import get_seen_filter
+from timer import MAX_POINTS, QUESTION_SECONDS, TIMED, Countdown, speed_score
+from trivia_client import report_metrics
+
+GAME_OVER_MS = 3000  # How long the final score stays up before the next game starts
+
+
+# QuizController is the quiz logic shared by both front-ends. A front-end mixes it in, calls
+# QuizController.__init__ with the widget that owns the quiz, builds its own layout (selection_bar,
+# question_label, answer_buttons, feedback and timer_label, wired to change_selection and check_answer)
+# and then calls play_game().
+class QuizController:
+    def __init__(self, parent):
+        self.parent = parent  # Widget whose event loop runs the quiz's timers and polls
+        self.game = None  # Headless game state, created for each batch of questions
+        self.amount = 4  # Number of questions
+        self.category = 18  # Category ID (Computer Science)
+        self.difficulty = None  # Any difficulty
+        self.adaptive = False  # Pick each question from the player's skill estimate instead
+        self.timed = False  # Race a countdown on every question and score on speed
+        self.player = "Player"
+        self.rating = get_rating(self.player)
+        self.seen = get_seen_filter(self.player)  # Questions this player was shown in earlier games
+        self.scheduler = None
+        self.bank = get_default_bank()  # Questions for every category, preloaded once the first game starts
+        self.prefetcher = BatchPrefetcher(self.fetch_batch)  # Fetch batches off the Tk thread
+        self.countdown = Countdown(parent, QUESTION_SECONDS, self.show_remaining, self.time_up)
+        self.shown_at = time.monotonic()  # Reused for every question
+        self.game_over_ms = GAME_OVER_MS
+        self._restart_id = None  # Pending restart after a finished game
+        self._paused_at = None  # When the quiz was hidden, while it is hidden
+
+    # Fetch a pool of questions from the Open Trivia Database API
+    def get_question_pool(self, amount: int, category: int, difficulty: str = None) -> list:
+        # Serve from the local question cache, which falls back to the API on a miss
+        return get_default_cache().get(amount, category, difficulty)
+
+    # Print the current question and its choices to the screen
+    @timed("print_question")
+    def print_question(self, question: Question) -> None:
+        # Display the question text
+        self.question_label.config(text=question.text)
+        self.seen.add(question)
+
+        # Update the pooled answer buttons in place and highlight any earlier answer
+        self.answer_buttons.show(question.answers, self.game.choice_for(self.game.index))
+
+        # Time the answer from the moment the question is up
+        self.shown_at = time.monotonic()
+        if self.timed:
+            self.countdown.start()
+
+    # Record the finished game, show the score in place of the question and start the next game shortly
+    def finish_game(self):
+        score, total = self.game.score(), len(self.game.questions)
+        if self.timed:
+            points = speed_score(self.game, QUESTION_SECONDS * 1000)
+            get_default_leaderboard().record(self.player, points, total * MAX_POINTS, TIMED, self.category)
+            message = f"Game over! You scored {score}/{total} for {points} points."
+        else:
+            get_default_leaderboard().record(self.player, score, total, ADAPTIVE if self.adaptive else SOLO,
+                                             self.category)
+            message = f"Game over! You scored {score}/{total}."
+        self.seen.save()
+        self.answer_buttons.hide()
+        self.question_label.config(text=message)
+        report_stats()
+        report_metrics()
+        self._restart_id = self.parent.after(self.game_over_ms, self.restart_game)
+
+    # Restart the game in place, reusing the same widgets
+    def restart_game(self):
+        # Drop the finished game, stop its clock and hide the answer buttons
+        if self._restart_id is not None:
+            self.parent.after_cancel(self._restart_id)
+            self._restart_id = None
+        self.countdown.cancel()
+        self.game = None
+        self.answer_buttons.hide()
+
+        # Start the next game with the next prefetched batch
+        self.play_game()
+
+    # Hold the clock while the quiz is hidden behind another page, so time is only spent on screen
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+            self.countdown.pause()
+        self.feedback.hide()
+
+    # The quiz is back on screen: carry on with the clock where it stopped
+    def resume(self):
+        if self._paused_at is None:
+            return
+        # A question put up while hidden is timed from now, an earlier one loses only the hidden time
+        now = time.monotonic()
+        self.shown_at += now - max(self._paused_at, self.shown_at)
+        self._paused_at = None
+        self.countdown.resume()
+
+    # Check the user's answer and display the correct answer
+    @timed("check_answer")
+    def check_answer(self, choice: int):
+        latency_ms = (time.monotonic() - self.shown_at) * 1000
+        self.countdown.cancel()
+        current_question = self.game.current
+        correct = self.game.answer(choice, latency_ms)
+        if self.adaptive:
+            # Score the answer, then queue the next question at the new skill level
+            self.scheduler.record(current_question, correct)
+            if len(self.game.questions) < self.amount:
+                next_question = self.scheduler.next_question()
+                if next_question is not None:
+                    self.game.add(next_question)
+        else:
+            self.rating.update(current_question.difficulty, correct)
+
+        # Show the result inline and move straight on; the banner hides itself
+        result = "Correct!" if correct else "Wrong!"
+        self.feedback.show(f"{result} The correct answer is: {current_question.correct_answer} "
+                           f"({latency_ms / 1000:.1f}s)", correct)
+        self.next_question()
+
+    # Show the next question, or finish once there are none left
+    def next_question(self):
+        if not self.game.finished:
+            self.print_question(self.game.current)
+        elif self.adaptive and len(self.game.questions) < self.amount:
+            # The scheduler had no question ready yet, so wait for its refill instead of ending early
+            self.answer_buttons.hide()
+            self.question_label.config(text="Loading questions...")
+            self.parent.after(POLL_INTERVAL, self.retry_next, self.game)
+        else:
+            self.finish_game()
+
+    # Retry adding the next adaptive question unless the game was replaced in the meantime
+    def retry_next(self, game):
+        if game is not self.game or not game.finished:
+            return
+        question = self.scheduler.next_question()
+        if question is not None:
+            game.add(question)
+        self.next_question()
+
+    # Show the time left in timed mode
+    def show_remaining(self, remaining: float):
+        self.timer_label.config(text=f"{remaining:.1f}s", fg="red" if remaining < 5 else "black")
+
+    # The countdown ran out before an answer, so the question counts as missed
+    def time_up(self):
+        if self.game is None or self.game.finished:
+            return
+        current_question = self.game.current
+        self.game.time_out(QUESTION_SECONDS * 1000)
+        self.rating.update(current_question.difficulty, False)
+        self.feedback.show(f"Time's up! The correct answer is: {current_question.correct_answer}", False)
+        self.next_question()
+
+    # Fetch, decode and shuffle the next batch of questions (runs on the prefetch worker thread)
+    def fetch_batch(self) -> list:
+        questions = self.bank.draw(self.amount, self.category, self.difficulty, skip=self.seen.__contains__)
+        if len(questions) == self.amount:
+            return questions
+        questions = ingest(self.get_question_pool(self.amount * 2, self.category, self.difficulty))
+        batch = self.seen.prefer_unseen(questions, self.amount)
+        if len(batch) < self.amount or batch[-1] in self.seen:
+            # Unseen questions come first, so this batch had to be padded: everything stocked locally
+            # has been seen, and the cache would not fetch more until its rows expire
+            get_default_cache().refill_async(PER_REQUEST, self.category, self.difficulty)
+        return batch
+
+    # Start the game
+    def play_game(self):
+        if self.adaptive:
+            self.play_adaptive()
+            return
+
+        # Preloaded questions start a game with no fetch at all
+        questions = self.bank.draw(self.amount, self.category, self.difficulty, skip=self.seen.__contains__)
+        if len(questions) == self.amount:
+            self.prefetcher.cancel()
+            self.start_batch(questions)
+            return
+
+        # Otherwise start as soon as the prefetch worker delivers a batch
+        self.question_label.config(text="Loading questions...")
+        self.prefetcher.when_ready(self.parent, self.start_batch, on_retry=self.show_retrying)
+
+    # The last fetch failed; the prefetcher tries again by itself, so just say so
+    def show_retrying(self):
+        self.question_label.config(text="Could not fetch questions. Retrying...")
+
+    # Start an adaptive game, which is built one question at a time
+    def play_adaptive(self):
+        if self.scheduler is None or self.scheduler.category != self.category:
+            self.scheduler = AdaptiveScheduler(self.bank, self.category, self.rating, skip=self.seen.__contains__)
+        question = self.scheduler.next_question()
+        if question is None:
+            # The scheduler is still filling its buckets, so try again shortly
+            self.question_label.config(text="Loading questions...")
+            self.parent.after(POLL_INTERVAL, self.retry_adaptive)
+            return
+        self.prefetcher.cancel()
+        self.start_batch([question])
+
+    # Retry starting an adaptive game unless one has started in the meantime
+    def retry_adaptive(self):
+        if self.adaptive and self.game is None:
+            self.play_adaptive()
+
+    # Switch category or difficulty and start a new game with it
+    def change_selection(self):
+        self.category, difficulty = self.selection_bar.selection()
+        self.adaptive = difficulty == ADAPTIVE
+        self.timed = difficulty == TIMED
+        self.difficulty = None if self.adaptive or self.timed else difficulty
+        if self.timed:
+            self.timer_label.place(relx=0.95, rely=0.02, anchor=tk.NE)
+        else:
+            self.timer_label.place_forget()
+
+        # Batches queued for the old selection are no longer wanted
+        self.prefetcher.stop()
+        self.prefetcher = BatchPrefetcher(self.fetch_batch)
+        self.restart_game()
+
+    # Begin playing a batch of questions handed over by the prefetcher
+    def start_batch(self, questions: list):
+        self.game = GameEngine(questions)
+        self.print_question(self.game.current)
+        # The first game is under way, so the bank preload can no longer hold it up
+        self.bank.preload_async()
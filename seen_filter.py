@@ -0,0 +1,151 @@
+import hashlib
+import math
+import os
+import struct
+import sys
+import threading
+import time
+
+# Per-player memory of questions already shown, kept across restarts. Each player gets a generational
+# Bloom filter keyed by a hash of the normalized, decoded question text: lookups cost a fixed number of
+# bit probes, memory is fixed at GENERATIONS filters of CAPACITY questions each, and once the newest
+# generation is full the oldest is dropped, so questions come back after roughly
+# (GENERATIONS - 1) * CAPACITY newer ones. False positives only ever hide an unseen question.
+
+SEEN_DIR = os.environ.get("TRIVIA_SEEN_DIR", ".seen")
+GENERATIONS = 4
+CAPACITY = 2000  # Questions per generation
+ERROR_RATE = 0.005  # False-positive rate of a lookup across all generations when every one is full
+
+MAGIC = b"TQSF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")  # magic, version, generations, capacity, bits, hashes
+
+
+# Collapse case and whitespace so trivially different copies of a question match
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+# SeenFilter is one player's generational Bloom filter
+class SeenFilter:
+    def __init__(self, path=None, generations=GENERATIONS, capacity=CAPACITY, error_rate=ERROR_RATE):
+        self.path = path
+        self.generations = generations
+        self.capacity = capacity
+        # A lookup checks every generation, so each one gets an equal share of the combined error rate
+        self.bits = math.ceil(-capacity * math.log(error_rate / generations) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._filters = [bytearray((self.bits + 7) // 8)]  # Oldest first
+        self._counts = [0]
+        self._lock = threading.Lock()
+
+    # Bit positions of a question, by double hashing one 128-bit digest
+    def _positions(self, text):
+        digest = hashlib.blake2b(normalize(text).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def _test(bloom, positions) -> bool:
+        return all(bloom[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    # Whether a Question (or decoded question text) has probably been seen
+    def __contains__(self, question) -> bool:
+        positions = self._positions(getattr(question, "text", question))
+        return any(self._test(bloom, positions) for bloom in self._filters)
+
+    # Remember a Question (or decoded question text) in the newest generation
+    def add(self, question) -> None:
+        positions = self._positions(getattr(question, "text", question))
+        with self._lock:
+            bloom = self._filters[-1]
+            if self._test(bloom, positions):
+                return
+            for p in positions:
+                bloom[p >> 3] |= 1 << (p & 7)
+            self._counts[-1] += 1
+            if self._counts[-1] >= self.capacity:
+                # Age out: start a new generation and forget the oldest once there are too many
+                self._filters.append(bytearray(len(bloom)))
+                self._counts.append(0)
+                if len(self._filters) > self.generations:
+                    del self._filters[0], self._counts[0]
+
+    # Up to `amount` questions, unseen ones first, topped up with seen ones rather than coming up short
+    def prefer_unseen(self, questions: list, amount: int) -> list:
+        unseen, seen = [], []
+        for question in questions:
+            (seen if question in self else unseen).append(question)
+        return (unseen + seen)[:amount]
+
+    def __len__(self):
+        return sum(self._counts)
+
+    # Write the filter atomically next to the other players' filters
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            data = [HEADER.pack(MAGIC, VERSION, len(self._filters), self.capacity, self.bits, self.hashes)]
+            data.append(struct.pack(f"<{len(self._counts)}I", *self._counts))
+            data.extend(self._filters)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as seen_file:
+            seen_file.write(b"".join(data))
+        os.replace(tmp, self.path)
+
+    # Load a saved filter; a missing, truncated or corrupt file, or one saved with other sizes, starts empty
+    @classmethod
+    def load(cls, path: str, **kwargs):
+        seen = cls(path, **kwargs)
+        size = len(seen._filters[0])
+        try:
+            with open(path, "rb") as seen_file:
+                data = seen_file.read()
+            magic, version, generations, capacity, bits, hashes = HEADER.unpack_from(data)
+            if (magic, version, capacity, bits, hashes) != (MAGIC, VERSION, seen.capacity, seen.bits, seen.hashes) \
+                    or generations < 1 or len(data) != HEADER.size + 4 * generations + generations * size:
+                return seen
+            counts = list(struct.unpack_from(f"<{generations}I", data, HEADER.size))
+        except (OSError, struct.error):
+            return seen
+        start = HEADER.size + 4 * generations
+        filters = [bytearray(data[start + i * size:start + (i + 1) * size]) for i in range(generations)]
+        seen._filters = filters[-seen.generations:]
+        seen._counts = counts[-seen.generations:]
+        return seen
+
+
+_filters = {}
+_filters_lock = threading.Lock()
+
+
+# Return a player's filter, loading it from SEEN_DIR on first use
+def get_seen_filter(player: str) -> SeenFilter:
+    with _filters_lock:
+        seen = _filters.get(player)
+        if seen is None:
+            name = hashlib.blake2b(player.encode(), digest_size=8).hexdigest()
+            seen = _filters[player] = SeenFilter.load(os.path.join(SEEN_DIR, name + ".seen"))
+        return seen
+
+
+# Main execution: report filter size, lookup speed and the false-positive rate it reaches
+if __name__ == "__main__":
+    questions = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    seen = SeenFilter()
+    start = time.perf_counter()
+    for i in range(questions):
+        seen.add(f"Seen question {i}?")
+    added = time.perf_counter() - start
+    start = time.perf_counter()
+    false_positives = sum(f"Unseen question {i}?" in seen for i in range(questions))
+    looked_up = time.perf_counter() - start
+    remembered = sum(f"Seen question {i}?" in seen for i in range(questions - CAPACITY, questions))
+    print(f"{len(seen._filters)} generations x {seen.bits // 8} bytes, {seen.hashes} hashes; "
+          f"{added / questions * 1e6:.2f} us per add, {looked_up / questions * 1e6:.2f} us per lookup")
+    print(f"false-positive rate {false_positives / questions:.2%}, "
+          f"last {CAPACITY} questions remembered: {remembered / CAPACITY:.0%}")
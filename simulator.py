@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from adaptive import SkillRating
+from engine import GameEngine, ingest
+
+# Headless bot playthroughs for tuning question pools: each game goes through the same fetch, ingest
+# (decode and shuffle), answer and score steps as the Tk apps, against a local question source, with
+# bots whose chance of answering correctly comes from adaptive.py's Elo model. Games run in chunks on
+# a process pool; every chunk returns a SimulationStats that is merged into the running totals as it
+# completes, and saved totals from separate runs can be merged the same way.
+
+# Bot skill profiles: an Elo rating plus per-category adjustments; a rating of None only guesses
+PROFILES = {
+    "guesser": {"rating": None},
+    "novice": {"rating": 950},
+    "casual": {"rating": 1150, "strengths": {11: 100, 12: 100, 14: 100}},
+    "expert": {"rating": 1400, "strengths": {17: 150, 18: 150, 19: 150}},
+}
+QUESTIONS_PER_GAME = 4
+CHUNK_GAMES = 5000  # Games per pool task
+HIDDEN_SPREAD = 300  # Synthetic per-question difficulty, in rating points either side of the label
+MIN_SAMPLES = 30  # Answers a question needs before it is considered for rebalancing
+
+
+# SimulationStats holds additive counters only, so chunks and whole runs merge by summing
+class SimulationStats:
+    def __init__(self):
+        self.games = 0
+        self.scores = {}  # score -> games
+        self.profiles = {}  # profile -> [answered, correct]
+        self.buckets = {}  # (category, difficulty) -> [answered, correct]
+        self.questions = {}  # (category, difficulty, type, text) -> [answered, correct]
+
+    @staticmethod
+    def _add(table, key, answered, correct):
+        counts = table.get(key)
+        if counts is None:
+            table[key] = [answered, correct]
+        else:
+            counts[0] += answered
+            counts[1] += correct
+
+    def record(self, profile: str, game: GameEngine) -> None:
+        self.games += 1
+        score = 0
+        for question, choice in zip(game.questions, game.choices):
+            correct = choice == question.correct
+            score += correct
+            self._add(self.buckets, (question.category, question.difficulty), 1, correct)
+            self._add(self.questions, (question.category, question.difficulty, question.type, question.text), 1,
+                      correct)
+        self._add(self.profiles, profile, len(game.questions), score)
+        self.scores[score] = self.scores.get(score, 0) + 1
+
+    def merge(self, other: "SimulationStats") -> None:
+        self.games += other.games
+        for score, games in other.scores.items():
+            self.scores[score] = self.scores.get(score, 0) + games
+        for name in ("profiles", "buckets", "questions"):
+            table = getattr(self, name)
+            for key, (answered, correct) in getattr(other, name).items():
+                self._add(table, key, answered, correct)
+
+    def to_dict(self) -> dict:
+        return {
+            "games": self.games,
+            "scores": [[score, games] for score, games in self.scores.items()],
+            "profiles": [[key, *counts] for key, counts in self.profiles.items()],
+            "buckets": [[*key, *counts] for key, counts in self.buckets.items()],
+            "questions": [[*key, *counts] for key, counts in self.questions.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SimulationStats":
+        stats = cls()
+        stats.games = data["games"]
+        stats.scores = {score: games for score, games in data["scores"]}
+        stats.profiles = {row[0]: row[1:] for row in data["profiles"]}
+        stats.buckets = {tuple(row[:2]): row[2:] for row in data["buckets"]}
+        stats.questions = {tuple(row[:4]): row[4:] for row in data["questions"]}
+        return stats
+
+
+# Questions sampled from stub_server's synthetic set or an offline question pack, by category
+class LocalSource:
+    def __init__(self, pack_path=None):
+        from question_bank import CATEGORIES
+
+        self.pack = None
+        if pack_path:
+            from question_pack import QuestionPack
+            self.pack = QuestionPack(pack_path)
+            self.categories = [category for category in CATEGORIES if self.pack.count(category)]
+        else:
+            from stub_server import build_questions
+            self.by_category = {}
+            for (category, _, _), questions in build_questions().items():
+                self.by_category.setdefault(category, []).extend(questions)
+            self.categories = sorted(self.by_category)
+
+    def fetch(self, amount: int, category: int, rng) -> list:
+        if self.pack is not None:
+            self.pack.rng = rng
+            return self.pack.fetch(amount, category)
+        return rng.sample(self.by_category[category], amount)
+
+
+# Rating offset that makes some questions harder or easier than their label, stable across processes
+def hidden_offset(text: str) -> int:
+    return zlib.crc32(text.encode()) % (2 * HIDDEN_SPREAD + 1) - HIDDEN_SPREAD
+
+
+_source = None
+_skill = SkillRating()
+
+
+def _init_worker(pack_path):
+    global _source
+    _source = LocalSource(pack_path)
+
+
+# Play one chunk of games; runs in a pool worker
+def simulate_chunk(seed: str, games: int, profiles: list, amount: int) -> SimulationStats:
+    rng = random.Random(seed)
+    stats = SimulationStats()
+    categories = _source.categories
+    for _ in range(games):
+        profile = rng.choice(profiles)
+        settings = PROFILES[profile]
+        category = rng.choice(categories)
+        game = GameEngine(ingest(_source.fetch(amount, category, rng), rng))
+        while not game.finished:
+            question = game.current
+            chance = 1 / len(question.answers)
+            if settings["rating"] is not None:
+                rating = settings["rating"] + settings.get("strengths", {}).get(category, 0) \
+                         - hidden_offset(question.text)
+                chance = max(chance, _skill.expected(question.difficulty or "medium", rating))
+            if rng.random() < chance:
+                choice = question.correct
+            else:
+                choice = rng.choice([i for i in range(len(question.answers)) if i != question.correct])
+            game.answer(choice)
+        stats.record(profile, game)
+    return stats
+
+
+# Run `games` games across a process pool, merging chunk results as they complete
+def run(games: int, profiles: list, workers: int, chunk=CHUNK_GAMES, amount=QUESTIONS_PER_GAME, seed=0,
+        pack_path=None, progress=True) -> SimulationStats:
+    total = SimulationStats()
+    # String seeds keep chunks of runs with different --seed values from replaying the same games
+    chunks = [(f"{seed}:{i}", min(chunk, games - i * chunk)) for i in range(-(-games // chunk))]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(pack_path,)) as pool:
+        pending = set()
+        while chunks or pending:
+            # Keep a bounded number of chunks in flight so results are merged and freed as they arrive
+            while chunks and len(pending) < workers * 2:
+                chunk_seed, chunk_games = chunks.pop(0)
+                pending.add(pool.submit(simulate_chunk, chunk_seed, chunk_games, profiles, amount))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                total.merge(future.result())
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"\r{total.games}/{games} games, {total.games / elapsed:.0f} games/s", end="", file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+    return total
+
+
+def accuracy(counts) -> float:
+    return counts[1] / counts[0] if counts[0] else 0.0
+
+
+# Print accuracy tables and the questions whose results fit another difficulty better
+def report(stats: SimulationStats, examples=10) -> None:
+    answered = sum(counts[0] for counts in stats.profiles.values())
+    correct = sum(counts[1] for counts in stats.profiles.values())
+    print(f"{stats.games} games, {answered} answers, {correct / max(answered, 1):.1%} correct")
+    for profile, counts in sorted(stats.profiles.items()):
+        print(f"  {profile:<10} {accuracy(counts):6.1%}")
+
+    print("Accuracy by category and difficulty:")
+    categories = sorted({category for category, _ in stats.buckets})
+    difficulties = ("easy", "medium", "hard")
+    for category in categories:
+        cells = [f"{accuracy(stats.buckets.get((category, d), (0, 0))):6.1%}" for d in difficulties]
+        print(f"  {category:<40} {' '.join(cells)}")
+
+    # A question belongs with the difficulty whose typical accuracy is closest to its own. True/false
+    # and multiple choice have different guessing floors, so each type is compared only with itself.
+    sampled = {key: accuracy(counts) for key, counts in stats.questions.items() if counts[0] >= MIN_SAMPLES}
+    print(f"{len(sampled)} questions with at least {MIN_SAMPLES} answers")
+    for qtype in sorted({key[2] for key in sampled}):
+        typical = {}
+        for difficulty in difficulties:
+            values = [value for (_, d, t, _), value in sampled.items() if d == difficulty and t == qtype]
+            if values:
+                typical[difficulty] = statistics.median(values)
+        moves = {}
+        for (category, difficulty, t, text), value in sampled.items():
+            if t != qtype or difficulty not in typical:
+                continue
+            best = min(typical, key=lambda d: abs(typical[d] - value))
+            if best != difficulty:
+                moves.setdefault((difficulty, best), []).append((abs(typical[difficulty] - value), category, text,
+                                                                 value))
+        print(f"  {qtype}: median accuracy " + ", ".join(f"{d} {value:.1%}" for d, value in typical.items()))
+        for (old, new), questions in sorted(moves.items()):
+            print(f"    {len(questions)} labelled {old} play like {new}")
+            for _, category, text, value in sorted(questions, reverse=True)[:examples]:
+                print(f"      {value:6.1%}  [{category}] {text}")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate bot games to tune question pools")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="comma-separated profiles to mix evenly")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=CHUNK_GAMES)
+    parser.add_argument("--questions", type=int, default=QUESTIONS_PER_GAME)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pack", help="question pack to play from instead of synthetic questions")
+    parser.add_argument("--out", help="save the merged statistics as JSON")
+    parser.add_argument("--merge", nargs="*", default=[], help="saved statistics to merge into this run")
+    args = parser.parse_args()
+
+    profiles = args.profiles.split(",")
+    for profile in profiles:
+        if profile not in PROFILES:
+            parser.error(f"unknown profile {profile!r}; choose from {', '.join(PROFILES)}")
+
+    start = time.perf_counter()
+    stats = run(args.games, profiles, args.workers, args.chunk, args.questions, args.seed, args.pack) \
+        if args.games else SimulationStats()
+    elapsed = time.perf_counter() - start
+    for path in args.merge:
+        with open(path) as stats_file:
+            stats.merge(SimulationStats.from_dict(json.load(stats_file)))
+    report(stats)
+    if args.games:
+        print(f"Simulated {args.games} games in {elapsed:.1f}s with {args.workers} workers")
+    if args.out:
+        with open(args.out, "w") as stats_file:
+            json.dump(stats.to_dict(), stats_file)
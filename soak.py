@@ -0,0 +1,104 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+# Soak test for kiosk mode: play thousands of simulated games back to back on one Tk root and
+# check that resident memory, widget count and Tcl command count stay flat.
+# Needs a display, so on a headless machine run it as: xvfb-run python soak.py [games] [main|Bigscreen]
+
+# Play from a private offline cache so the soak never touches the network, and keep its scores and
+# seen questions out of the kiosk's real leaderboard and seen filters
+SCRATCH = tempfile.mkdtemp()
+os.environ["TRIVIA_OFFLINE"] = "1"
+os.environ["TRIVIA_CACHE_PATH"] = os.path.join(SCRATCH, "soak_cache.db")
+os.environ["TRIVIA_LEADERBOARD_PATH"] = os.path.join(SCRATCH, "soak_leaderboard.db")
+os.environ["TRIVIA_SEEN_DIR"] = os.path.join(SCRATCH, "seen")
+
+from question_cache import get_default_cache  # noqa: E402
+
+WARMUP_GAMES = 50  # Games played before the baseline is taken
+RSS_TOLERANCE = 4 * 1024 * 1024  # Bytes of RSS growth allowed after warm-up
+COMMAND_TOLERANCE = 8  # Pending `after` callbacks briefly hold a Tcl command each
+SAMPLE_EVERY = 500
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def count_widgets(widget) -> int:
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def snapshot(app) -> tuple:
+    return rss_bytes(), count_widgets(app), len(app.tk.call("info", "commands"))
+
+
+# Fill the offline cache with synthetic Computer Science questions
+def seed_cache(count=400) -> None:
+    questions = [{"question": f"Soak question {i}?", "correct_answer": "Right",
+                  "incorrect_answers": ["Wrong 1", "Wrong 2", "Wrong 3"],
+                  "difficulty": "easy", "type": "multiple"} for i in range(count)]
+    get_default_cache().store(questions, 18)
+
+
+# Build the app for an entry point and return it with the frame that plays the quiz
+def build(entry: str):
+    module = __import__(entry)
+    app = module.MobileFrame()
+    if entry == "main":
+        quiz = app.trivia_game
+    else:
+        app.show_frame("QuizFrame")
+        quiz = app.frames["QuizFrame"]
+    quiz.game_over_ms = 0  # Start the next game straight away instead of leaving the score up
+    return app, quiz
+
+
+# Pump the event loop until the quiz has a question on screen
+def wait_for_question(app, quiz) -> None:
+    while quiz.game is None or quiz.game.finished:
+        app.update()
+
+
+def play(app, quiz, games: int) -> None:
+    for _ in range(games):
+        wait_for_question(app, quiz)
+        game = quiz.game
+        while quiz.game is game and not game.finished:
+            quiz.check_answer(random.randrange(len(game.current.answers)))
+        app.update()
+
+
+# Main execution
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    entry = sys.argv[2] if len(sys.argv) > 2 else "main"
+    seed_cache()
+    app, quiz = build(entry)
+
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence the per-game cache reports
+        play(app, quiz, WARMUP_GAMES)
+    base_rss, base_widgets, base_commands = snapshot(app)
+    print(f"baseline after {WARMUP_GAMES} games: RSS {base_rss / 2**20:.1f} MiB, "
+          f"{base_widgets} widgets, {base_commands} Tcl commands")
+
+    played = 0
+    while played < games:
+        batch = min(SAMPLE_EVERY, games - played)
+        with contextlib.redirect_stdout(io.StringIO()):
+            play(app, quiz, batch)
+        played += batch
+        rss, widgets, commands = snapshot(app)
+        print(f"{played:>7} games: RSS {rss / 2**20:.1f} MiB ({(rss - base_rss) / 2**10:+.0f} KiB), "
+              f"{widgets} widgets, {commands} Tcl commands")
+
+    app.destroy()
+    assert widgets == base_widgets, f"widget count grew from {base_widgets} to {widgets}"
+    assert commands - base_commands <= COMMAND_TOLERANCE, f"Tcl command count grew from {base_commands} to {commands}"
+    assert rss - base_rss <= RSS_TOLERANCE, f"RSS grew by {(rss - base_rss) / 2**20:.1f} MiB"
+    print(f"OK: {games} games with flat memory and widget counts")
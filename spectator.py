@@ -0,0 +1,110 @@
+import heapq
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Live room state for the Bigscreen spectator view. Events from any thread are folded into a
+# SpectatorModel in O(1) each; the Tk side takes at most one snapshot per frame, so a burst of
+# thousands of events costs a single redraw.
+#
+# Events are dicts with a "type":
+#   "state"    a full game_server.py room state (question, tally, leaders, players)
+#   "question" {"text", "answers"}, which also clears the tally
+#   "answer"   {"choice"}
+#   "score"    {"player", "score"}
+
+MAX_FPS = 30  # Redraws per second at most, however fast events arrive
+LEADERS = 10
+SPECTATE_URL = os.environ.get("TRIVIA_SPECTATE_URL", "http://127.0.0.1:8766")
+SPECTATE_ROOM = os.environ.get("TRIVIA_SPECTATE_ROOM", "room0")
+RETRY_DELAY = 2.0  # Seconds before polling again after the server could not be reached
+
+
+# Snapshot of a room as last drawn: plain tuples so the frame can compare them cheaply
+class SpectatorSnapshot:
+    __slots__ = ("question", "answers", "tally", "leaders", "players", "events")
+
+    def __init__(self, question, answers, tally, leaders, players, events):
+        self.question = question
+        self.answers = answers
+        self.tally = tally
+        self.leaders = leaders  # Best-first (player, score) pairs
+        self.players = players
+        self.events = events  # Events folded in so far
+
+
+# SpectatorModel folds incoming events into the latest room state under a lock
+class SpectatorModel:
+    def __init__(self, leaders=LEADERS):
+        self.leaders = leaders
+        self.question = ""
+        self.answers = ()
+        self.tally = []
+        self.scores = {}
+        self.players = 0
+        self.events = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    # Fold one event in; safe to call from any thread
+    def push(self, event: dict) -> None:
+        kind = event["type"]
+        with self._lock:
+            if kind == "answer":
+                choice = event["choice"]
+                if 0 <= choice < len(self.tally):
+                    self.tally[choice] += 1
+            elif kind == "score":
+                self.scores[event["player"]] = event["score"]
+            elif kind == "question":
+                self.question = event["text"]
+                self.answers = tuple(event["answers"])
+                self.tally = [0] * len(self.answers)
+            elif kind == "state":
+                self.question = event["question"] or ""
+                self.answers = tuple(event["answers"])
+                self.tally = list(event["tally"])
+                self.scores = dict(event["leaders"])
+                self.players = event["players"]
+            self.events += 1
+            self._dirty = True
+
+    # Return a snapshot if anything changed since the last call, otherwise None
+    def take(self):
+        with self._lock:
+            if not self._dirty:
+                return None
+            self._dirty = False
+            leaders = heapq.nlargest(self.leaders, self.scores.items(), key=lambda item: item[1])
+            return SpectatorSnapshot(self.question, self.answers, tuple(self.tally), tuple(leaders),
+                                     max(self.players, len(self.scores)), self.events)
+
+
+# RoomFeed long-polls a game_server.py room on a worker thread and pushes each new state
+class RoomFeed:
+    def __init__(self, model: SpectatorModel, url=SPECTATE_URL, room=SPECTATE_ROOM):
+        self.model = model
+        self.url = url.rstrip("/")
+        self.room = room
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="spectator-feed", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self):
+        version = 0
+        while not self._stopped.is_set():
+            try:
+                with urllib.request.urlopen(f"{self.url}/state?room={self.room}&since={version}", timeout=30) as response:
+                    state = json.load(response)
+            except (urllib.error.URLError, OSError, ValueError):
+                time.sleep(RETRY_DELAY)  # No server or no such room yet
+                continue
+            version = state["version"]
+            state["type"] = "state"
+            self.model.push(state)
@@ -0,0 +1,174 @@
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from question_bank import CATEGORIES, DIFFICULTIES
+
+# A local stand-in for opentdb.com that speaks the same api.php / api_token.php protocol, with
+# configurable latency, error rate and rate limiting so fetches can be measured reproducibly.
+
+QUESTIONS_PER_KEY = 200  # Synthetic questions per category/difficulty/type
+MAX_AMOUNT = 50
+
+
+# Build a deterministic synthetic question set for every category, difficulty and type
+def build_questions(per_key=QUESTIONS_PER_KEY) -> dict:
+    rng = random.Random(0)
+    questions = {}
+    for category, name in CATEGORIES.items():
+        for difficulty in DIFFICULTIES:
+            for qtype in ("multiple", "boolean"):
+                key = (category, difficulty, qtype)
+                questions[key] = []
+                for i in range(per_key):
+                    if qtype == "boolean":
+                        correct, incorrect = rng.choice([("True", ["False"]), ("False", ["True"])])
+                    else:
+                        correct, incorrect = f"Answer &amp; {i}", [f"Wrong &quot;{i}.{j}&quot;" for j in range(3)]
+                    questions[key].append({
+                        "type": qtype,
+                        "difficulty": difficulty,
+                        "category": name,
+                        "question": f"{name} {difficulty} {qtype} question #{i} &#039;stub&#039;?",
+                        "correct_answer": correct,
+                        "incorrect_answers": incorrect,
+                    })
+    return questions
+
+
+# StubState holds the question set, issued tokens and limiter state shared by every request
+class StubState:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0.0, per_key=QUESTIONS_PER_KEY):
+        self.latency = latency  # Seconds added to every response
+        self.jitter = jitter  # Extra uniformly random seconds on top of latency
+        self.error_rate = error_rate  # Fraction of requests answered with HTTP 500
+        self.rate_limit = rate_limit  # Minimum seconds between api.php requests per client, 0 to disable
+        self.questions = build_questions(per_key)
+        self.tokens = {}  # token -> set of served question ids
+        self.last_request = {}  # client address -> monotonic time of its last api.php request
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    # Answer an api.php query with OpenTDB's response codes
+    def api(self, client, params) -> dict:
+        with self.lock:
+            self.requests += 1
+            now = time.monotonic()
+            if self.rate_limit and now - self.last_request.get(client, -self.rate_limit) < self.rate_limit:
+                return {"response_code": 5, "results": []}
+            self.last_request[client] = now
+
+            try:
+                amount = int(params.get("amount", "10"))
+                category = int(params["category"]) if "category" in params else None
+            except ValueError:
+                return {"response_code": 2, "results": []}
+            difficulty = params.get("difficulty")
+            qtype = params.get("type")
+            if not 1 <= amount <= MAX_AMOUNT or (category is not None and category not in CATEGORIES) \
+                    or (difficulty and difficulty not in DIFFICULTIES) or (qtype and qtype not in ("multiple", "boolean")):
+                return {"response_code": 2, "results": []}
+
+            candidates = [question for (c, d, t), questions in self.questions.items()
+                          if (category is None or c == category) and (not difficulty or d == difficulty)
+                          and (not qtype or t == qtype) for question in questions]
+
+            token = params.get("token")
+            seen = None
+            if token:
+                seen = self.tokens.get(token)
+                if seen is None:
+                    return {"response_code": 3, "results": []}
+                candidates = [question for question in candidates if id(question) not in seen]
+                if len(candidates) < amount:
+                    return {"response_code": 4, "results": []}
+            if len(candidates) < amount:
+                return {"response_code": 1, "results": []}
+
+            results = random.sample(candidates, amount)
+            if seen is not None:
+                seen.update(id(question) for question in results)
+            return {"response_code": 0, "results": results}
+
+    # Answer an api_token.php command
+    def token(self, params) -> dict:
+        command = params.get("command")
+        with self.lock:
+            if command == "request":
+                token = secrets.token_hex(32)
+                self.tokens[token] = set()
+                return {"response_code": 0, "response_message": "Token Generated Successfully!", "token": token}
+            token = params.get("token")
+            if command == "reset" and token in self.tokens:
+                self.tokens[token].clear()
+                return {"response_code": 0, "token": token}
+        return {"response_code": 3, "results": []}
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+        disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            delay = state.latency + (random.uniform(0, state.jitter) if state.jitter else 0.0)
+            if delay:
+                time.sleep(delay)
+            if state.error_rate and random.random() < state.error_rate:
+                self.send_json(500, {"error": "injected failure"})
+            elif url.path == "/api.php":
+                self.send_json(200, state.api(self.client_address[0], params))
+            elif url.path == "/api_token.php":
+                self.send_json(200, state.token(params))
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        def send_json(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark output clean
+
+    return Handler
+
+
+# Start a stub server on a background thread; returns (server, base URL)
+def start_stub_server(host="127.0.0.1", port=0, **config):
+    state = StubState(**config)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# Main execution: run a stub the apps can use with TRIVIA_API_BASE=http://127.0.0.1:<port>
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Open Trivia Database stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="minimum seconds between requests per client")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                                    error_rate=args.error_rate, rate_limit=args.rate_limit)
+    print(f"Serving OpenTDB stand-in at {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,94 @@
+import time
+
+TIMED = "timed"  # Difficulty setting for the against-the-clock solo mode; questions are of any difficulty
+QUESTION_SECONDS = 15  # Time allowed per question in timed mode
+TICK_INTERVAL = 100  # Milliseconds between countdown display updates
+MAX_POINTS = 100  # Points for a correct answer given instantly
+MIN_POINTS = 10  # Points for a correct answer given on the buzzer
+
+
+# Points for one answer in timed mode: faster correct answers score more, wrong or late ones nothing
+def speed_points(correct: bool, latency_ms: float, limit_ms: float) -> int:
+    if not correct or latency_ms > limit_ms:
+        return 0
+    return round(MIN_POINTS + (MAX_POINTS - MIN_POINTS) * (1 - latency_ms / limit_ms))
+
+
+# Total timed-mode points of a GameEngine whose answers carry latencies
+def speed_score(game, limit_ms: float) -> int:
+    return sum(speed_points(choice == question.correct, latency, limit_ms)
+               for question, choice, latency in zip(game.questions, game.choices, game.latencies))
+
+
+# Countdown ticks on the Tk event loop with `after`, but measures time with time.monotonic: every tick
+# is scheduled for its slot relative to the start, so late ticks do not push the later ones back, and
+# the remaining time shown is always the real remaining time however busy the UI is.
+class Countdown:
+    def __init__(self, widget, seconds, on_tick, on_expire, interval=TICK_INTERVAL):
+        # on_tick(remaining_seconds) updates the display; on_expire() runs once when time is up
+        self.widget = widget
+        self.seconds = seconds
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.interval = interval
+        self.started = None
+        self.paused = False
+        self._ticks = 0
+        self._after_id = None
+        self._used_ms = None  # Time already used by a countdown held by pause(), resumed by resume()
+
+    # Start counting down from the full time; while paused, the countdown waits for resume()
+    def start(self) -> None:
+        self.cancel()
+        self.started = time.monotonic()
+        self._ticks = 0
+        if self.paused:
+            self._used_ms = 0.0
+            return
+        self._tick()
+
+    def cancel(self) -> None:
+        self._used_ms = None
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    # Stop the clock, keeping the time already used, e.g. while the countdown is not on screen
+    def pause(self) -> None:
+        if self.paused:
+            return
+        self.paused = True
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+            self._used_ms = self.elapsed_ms()
+
+    # Carry on from where pause() stopped the clock
+    def resume(self) -> None:
+        if not self.paused:
+            return
+        self.paused = False
+        if self._used_ms is not None:
+            self.started = time.monotonic() - self._used_ms / 1000
+            self._used_ms = None
+            self._tick()
+
+    # Milliseconds since start, measured on the monotonic clock
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started) * 1000 if self.started is not None else 0.0
+
+    def remaining(self) -> float:
+        return max(0.0, self.seconds - self.elapsed_ms() / 1000)
+
+    def _tick(self):
+        self._after_id = None
+        remaining = self.remaining()
+        self.on_tick(remaining)
+        if remaining <= 0:
+            self.on_expire()
+            return
+        # Aim for the next slot after now, skipping any slots a busy event loop already missed
+        elapsed = self.elapsed_ms()
+        self._ticks = max(self._ticks + 1, int(elapsed // self.interval) + 1)
+        due = min(self._ticks * self.interval, self.seconds * 1000)
+        self._after_id = self.widget.after(max(0, round(due - elapsed)), self._tick)
@@ -0,0 +1,219 @@
+import collections
+import os
+import random
+import threading
+import time
+
+import instrumentation
+
+requests = None  # Imported by the first TriviaClient so window startup does not pay for it
+
+# Point TRIVIA_API_BASE at a local stand-in (see stub_server.py) to run without opentdb.com
+API_BASE = os.environ.get("TRIVIA_API_BASE", "https://opentdb.com").rstrip("/")
+API_URL = API_BASE + "/api.php"
+TOKEN_URL = API_BASE + "/api_token.php"
+
+# OpenTDB response codes
+RESPONSE_SUCCESS = 0
+RESPONSE_NO_RESULTS = 1
+RESPONSE_INVALID_PARAMETER = 2
+RESPONSE_TOKEN_NOT_FOUND = 3
+RESPONSE_TOKEN_EMPTY = 4
+RESPONSE_RATE_LIMIT = 5
+
+# OpenTDB allows one request every 5 seconds per IP; a local stand-in can take more
+DEFAULT_RATE = float(os.environ.get("TRIVIA_API_RATE", 1 / 5))
+DEFAULT_BURST = 1
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # Seconds; doubled on every retry before jitter is applied
+BACKOFF_CAP = 30.0
+LATENCY_WINDOW = 500  # Number of recent fetch latencies kept for percentiles
+
+
+# TokenBucket spaces requests out client-side so we stay under the API rate limit
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Block until a token is available, then take it
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# TriviaClient is the shared, pooled HTTP client for the Open Trivia Database
+class TriviaClient:
+    def __init__(self, api_url=API_URL, token_url=TOKEN_URL, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_retries=MAX_RETRIES, use_token=True, timeout=10):
+        self.api_url = api_url
+        self.token_url = token_url
+        self.max_retries = max_retries
+        self.use_token = use_token
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        _import_requests()
+
+        # One pooled keep-alive session shared by every fetch in the process
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.token = None
+        self._token_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.counters = {"requests": 0, "retries": 0, "rate_limited": 0, "token_resets": 0, "errors": 0}
+
+    # Fetch a pool of questions, retrying rate limits and token problems with jittered backoff
+    def fetch(self, amount: int, category: int, difficulty: str = None, qtype: str = None) -> list:
+        params = {"amount": amount, "category": category}
+        if difficulty:
+            params["difficulty"] = difficulty
+        if qtype:
+            params["type"] = qtype
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(self.backoff(attempt))
+            if self.use_token:
+                params["token"] = self.get_token()
+
+            data = self._get(self.api_url, params)
+            if data is None:
+                continue  # Network or HTTP error, already logged
+
+            code = data.get("response_code", RESPONSE_SUCCESS)
+            if code == RESPONSE_SUCCESS and "results" in data:
+                return data["results"]
+            if code == RESPONSE_RATE_LIMIT:
+                self._count("rate_limited")
+                continue
+            if code == RESPONSE_TOKEN_EMPTY:
+                # Every question for this token has been served, so start the cycle again
+                self.reset_token()
+                continue
+            if code == RESPONSE_TOKEN_NOT_FOUND:
+                with self._token_lock:
+                    self.token = None
+                continue
+            if code in (RESPONSE_NO_RESULTS, RESPONSE_INVALID_PARAMETER):
+                print(f"OpenTDB returned response code {code} for {params}")
+                return []
+            print("Unexpected response format:")
+            print(data)
+            return []
+
+        print(f"Giving up after {self.max_retries} retries")
+        return []
+
+    # Return the current session token, requesting one on first use
+    def get_token(self):
+        with self._token_lock:
+            if self.token is None:
+                data = self._get(self.token_url, {"command": "request"})
+                if data and data.get("response_code") == RESPONSE_SUCCESS:
+                    self.token = data["token"]
+            return self.token
+
+    # Reset an exhausted token so it can serve the full question set again
+    def reset_token(self) -> None:
+        with self._token_lock:
+            self._count("token_resets")
+            if self.token is None:
+                return
+            data = self._get(self.token_url, {"command": "reset", "token": self.token})
+            if not data or data.get("response_code") != RESPONSE_SUCCESS:
+                self.token = None
+
+    # Exponential backoff with full jitter
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    # Return request counters and fetch latency percentiles in milliseconds
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            latencies = sorted(self.latencies)
+            metrics = dict(self.counters)
+        if latencies:
+            metrics["latency_p50_ms"] = latencies[len(latencies) // 2] * 1000
+            metrics["latency_p99_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        return metrics
+
+    def close(self) -> None:
+        self.session.close()
+
+    # Rate-limited GET returning decoded JSON, or None on a network/HTTP error
+    def _get(self, url, params):
+        self.bucket.acquire()
+        self._count("requests")
+        start = time.perf_counter()
+        try:
+            with instrumentation.span("fetch"):
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            if response.status_code == 429:
+                self._count("rate_limited")
+                return None
+            response.raise_for_status()  # Check for any HTTP errors
+            with instrumentation.span("json_parse"):
+                return response.json()
+        except requests.exceptions.HTTPError as err:
+            print(f"HTTP error occurred: {err}")
+        except requests.exceptions.RequestException as e:
+            print(f"Request error occurred: {e}")
+        except ValueError as e:
+            print(f"Invalid JSON in response: {e}")
+        finally:
+            with self._metrics_lock:
+                self.latencies.append(time.perf_counter() - start)
+        self._count("errors")
+        return None
+
+    def _count(self, name):
+        with self._metrics_lock:
+            self.counters[name] += 1
+        instrumentation.count(f"client_{name}")
+
+
+# Import requests on first use
+def _import_requests():
+    global requests
+    if requests is None:
+        import requests.adapters  # Binds the module-level `requests` name
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+# Return the process-wide client shared by both front-ends
+def get_default_client() -> TriviaClient:
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = TriviaClient()
+        return _default_client
+
+
+# Print the client's request counters and latency percentiles
+def report_metrics(client: TriviaClient = None) -> None:
+    client = client or get_default_client()
+    metrics = client.metrics()
+    line = "Trivia client: {requests} requests, {retries} retries, {rate_limited} rate limited, " \
+           "{token_resets} token resets, {errors} errors".format(**metrics)
+    if "latency_p50_ms" in metrics:
+        line += ", p50 {latency_p50_ms:.0f} ms, p99 {latency_p99_ms:.0f} ms".format(**metrics)
+    print(line)
@@ -0,0 +1,85 @@
+import tkinter as tk
+
+MAX_CHOICES = 4  # OpenTDB multiple-choice questions have four answers, true/false has two
+FEEDBACK_MS = 2000  # How long answer feedback stays on screen
+
+
+# AnswerButtonPool reuses one set of answer buttons for every question instead of recreating them
+class AnswerButtonPool:
+    def __init__(self, parent, command, size=MAX_CHOICES, width=50):
+        # command(i) is called with the index of the answer that was clicked
+        self.buttons = []
+        for i in range(size):
+            button = tk.Button(parent, width=width, command=lambda i=i: command(i))
+            self.buttons.append(button)
+        self.default_bg = self.buttons[0].cget("bg")
+        self.visible = 0  # Buttons [0, visible) are currently packed
+
+    # Show one button per answer, updating them in place, and hide the rest
+    def show(self, answers, chosen=None) -> None:
+        count = len(answers)
+        for i in range(count):
+            if chosen is None:
+                state, bg = tk.NORMAL, self.default_bg
+            elif i == chosen:
+                state, bg = tk.NORMAL, "light green"  # Highlight the user's choice
+            else:
+                state, bg = tk.DISABLED, self.default_bg  # Disable the others once answered
+            self.buttons[i].config(text=f"{i+1}. {answers[i]}", state=state, bg=bg)
+        self._set_visible(count)
+
+    # Hide every button without destroying it
+    def hide(self) -> None:
+        self._set_visible(0)
+
+    # Pack or forget only the buttons whose visibility actually changes
+    def _set_visible(self, count):
+        for button in self.buttons[self.visible:count]:
+            button.pack(pady=5)
+        for button in self.buttons[count:self.visible]:
+            button.pack_forget()
+        self.visible = count
+
+
+# SelectionBar lets the player pick a category and difficulty for the next game
+class SelectionBar(tk.Frame):
+    def __init__(self, parent, categories: dict, difficulties, on_change, category, difficulty=None):
+        # on_change() is called after either menu changes; read the choice back with selection()
+        tk.Frame.__init__(self, parent)
+        self.category_ids = {name: category_id for category_id, name in categories.items()}
+        self.category = tk.StringVar(self, categories[category])
+        self.difficulty = tk.StringVar(self, difficulty or "any")
+
+        category_menu = tk.OptionMenu(self, self.category, *self.category_ids, command=lambda _: on_change())
+        category_menu.pack(side=tk.LEFT, padx=5)
+        difficulty_menu = tk.OptionMenu(self, self.difficulty, "any", *difficulties, command=lambda _: on_change())
+        difficulty_menu.pack(side=tk.LEFT, padx=5)
+
+    # Return the selected (category ID, difficulty or None for any)
+    def selection(self) -> tuple:
+        difficulty = self.difficulty.get()
+        return self.category_ids[self.category.get()], None if difficulty == "any" else difficulty
+
+
+# FeedbackBanner shows the result of an answer inline and hides itself, without blocking the event loop
+class FeedbackBanner:
+    def __init__(self, parent, relx=0.6, rely=0.92):
+        self.label = tk.Label(parent, font=("Helvetica", 12), fg="white", padx=10, pady=4)
+        self.relx = relx
+        self.rely = rely
+        self._hide_id = None
+
+    def show(self, text: str, good: bool, duration=FEEDBACK_MS) -> None:
+        self.label.config(text=text, bg="#2e7d32" if good else "#c62828")
+        self.label.place(relx=self.relx, rely=self.rely, anchor=tk.CENTER)
+        self.label.lift()
+        # A newer message replaces the old one and restarts the hide timer
+        if self._hide_id is not None:
+            self.label.after_cancel(self._hide_id)
+        self._hide_id = self.label.after(duration, self.hide)
+
+    def hide(self) -> None:
+        if self._hide_id is not None:
+            self.label.after_cancel(self._hide_id)
+            self._hide_id = None
+        self.label.place_forget()